@@ -1,2 +1,4 @@
-from .profile import by_day_of_year
-from .utils import *
\ No newline at end of file
+from .profile import by_day_of_year, by_year
+from .batch import by_table
+from . import meter
+from .utils import *
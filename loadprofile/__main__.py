@@ -0,0 +1,6 @@
+# rebuilds the .npy base profiles in default_data from their .txt sources
+from .profile import compile_base_profiles
+
+
+if __name__ == '__main__':
+    compile_base_profiles()
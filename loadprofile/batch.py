@@ -0,0 +1,131 @@
+"""
+Load profiles of many households and businesses at once.
+
+The parameters of by_day_of_year are given as columns of a table, one row per building. Scaling
+factors are looked up as arrays and broadcast over the shared h0/g0 base profiles, so the only
+python loops run over distinct parameter values (ratings, building types, shifts), not over buildings.
+"""
+
+import numpy as np
+from . import profile
+from .utils import *
+
+
+__building_types = [ResidentialBuildingType.House, ResidentialBuildingType.Apartment]
+__warm_water = ['ohneStrom', 'mitStrom']
+
+# stromspiegel of scale_stromspiegel_h0 as (building type, warm water, residents, rating) in [kWh/year]
+scale_h0_table = np.array([
+    [profile.scale_stromspiegel_h0[building_type][warm_water] for warm_water in __warm_water]
+    for building_type in __building_types
+], dtype=np.float64)
+
+# defaults of by_day_of_year
+__defaults = {
+    'profile': ProfileType.Residential,
+    'number_of_residents': 1,
+    'building_type': ResidentialBuildingType.House,
+    'is_warm_water_electric': False,
+    'rating': ResidentialRating.D,
+    'area': np.nan,
+    'shift': 0,
+}
+
+
+def __column(table, name, n):
+    if name in table:
+        values = np.asarray(table[name])
+        # missing areas are given as None
+        return values.astype(np.float64) if name == 'area' and values.dtype == object else values
+    return np.full(n, __defaults[name])
+
+
+def __lookup(values, mapping, error):
+    # map every distinct value once, the result is indexed per row
+    distinct, inverse = np.unique(values, return_inverse=True)
+    try:
+        mapped = np.array([mapping(value) for value in distinct])
+    except (KeyError, ValueError) as e:
+        raise error(f"Unknown value {e}!")
+    return mapped[inverse.ravel()] if len(distinct) else np.zeros(0, dtype=np.int64)
+
+
+def get_scalings(table) -> np.ndarray:
+    """
+    Factor of the base profile for every row of the table, see profile.get_scaling.
+    :param table: dict of columns or DataFrame with by_day_of_year's parameters, missing columns use its defaults
+    :return: numpy array of the factors
+    """
+    n = len(table[next(iter(table))])
+    if n == 0:
+        return np.empty(0)
+
+    profiles = __column(table, 'profile', n).astype(str)
+    ratings = __column(table, 'rating', n).astype(str)
+    area = __column(table, 'area', n).astype(np.float64)
+
+    residential = profiles == ProfileType.Residential
+    commercial = profiles == ProfileType.Commercial
+    if not np.all(residential | commercial):
+        raise UnknownLoadProfileType(f"Unknown load profile type: {profiles[~(residential | commercial)][0]}!")
+
+    # class names and business types are words, all other ratings are consumptions in [kWh/year]
+    numeric = ~np.char.isalpha(np.char.replace(ratings, '_', ''))
+    consumption = np.zeros(n)
+    consumption[numeric] = ratings[numeric].astype(np.float64)
+
+    factors = np.empty(n)
+
+    # households by stromspiegel class
+    rows = residential & ~numeric
+    residents = np.minimum(__column(table, 'number_of_residents', n)[rows].astype(np.int64), 6)
+    building_type = __lookup(
+        __column(table, 'building_type', n)[rows].astype(str), __building_types.index, LoadProfileException
+    )
+    warm_water = __column(table, 'is_warm_water_electric', n)[rows].astype(bool).astype(np.int64)
+    rating = __lookup(ratings[rows], profile.get_usage, LoadProfileException)
+    factors[rows] = scale_h0_table[building_type, warm_water, residents - 1, rating] / 1000
+
+    # households and businesses by consumption
+    factors[residential & numeric] = consumption[residential & numeric] / 1000
+    factors[commercial & numeric] = consumption[commercial & numeric] / 1018.7044245
+
+    # businesses by area
+    rows = commercial & ~numeric
+    if np.any(np.isnan(area[rows])):
+        raise LoadProfileException(f"Area is not defined!")
+    per_m2 = __lookup(ratings[rows], profile.stromspiegel_g0_per_m2.__getitem__, LoadProfileException)
+    factors[rows] = per_m2 * area[rows] / 1018.7044245
+
+    return factors
+
+
+def by_table(table, dtype=np.float32) -> np.ndarray:
+    """
+    Annual load profiles of all rows of the table, like by_year per row.
+    :param table: dict of columns or DataFrame with by_day_of_year's parameters, missing columns use its defaults
+    :return: numpy array of shape (rows, 365, 24) in [W]
+    """
+    factors = get_scalings(table).astype(dtype)
+    n = len(factors)
+    if n == 0:
+        return np.empty((0, 365, 24), dtype=dtype)
+
+    profiles = __column(table, 'profile', n).astype(str)
+    shifts = __column(table, 'shift', n).astype(np.int64)
+
+    result = np.empty((n, 365, 24), dtype=dtype)
+
+    # households, one rolled h0 per distinct shift
+    residential = profiles == ProfileType.Residential
+    h0 = profile.h0.astype(dtype)
+    for shift in np.unique(shifts[residential]):
+        rows = residential & (shifts == shift)
+        base = np.roll(h0.ravel(), shift).reshape(h0.shape) if shift != 0 else h0
+        result[rows] = base * factors[rows, None, None]
+
+    # businesses, shift does not apply to g0
+    commercial = ~residential
+    result[commercial] = profile.g0[profile.g0_rows].astype(dtype) * factors[commercial, None, None]
+
+    return result
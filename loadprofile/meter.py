@@ -0,0 +1,225 @@
+"""
+Measured load series of smart meters.
+
+Meter exports hold one reading per interval (typically 15 minutes) over one or more years. The files
+are read in blocks of a fixed number of readings, every block is mapped to the hours of the 365-day
+year and accumulated with np.bincount, so the memory is bounded by the block size and not by the file.
+Several years are averaged per hour, the 29th of February is dropped like in the standard profiles.
+The result has the shape of by_year and can be passed to Simulation as load_profile.
+
+The hours of the weather data and of the simulation are UTC+1 without daylight saving time. Timestamps in
+another zone are moved there with utc_offset, local wall clock time with the European summer time
+(last Sunday of March to last Sunday of October) with daylight_saving. numpy reads ISO timestamps with
+an offset like '+02:00' as UTC, those need utc_offset=0.
+"""
+
+import itertools
+import numpy as np
+from .utils import *
+
+
+# readings per block
+CHUNK_SIZE = 2**16
+
+# factors of power readings to [W] and of energy readings to [Wh]
+__power_units = {'W': 1, 'kW': 1000}
+__energy_units = {'Wh': 1, 'kWh': 1000}
+
+# characters of 'DD.MM.YYYY HH:MM' in the order of 'YYYY-MM-DD HH:MM'
+__dayfirst_order = [6, 7, 8, 9, 2, 3, 4, 5, 0, 1, 10, 11, 12, 13, 14, 15]
+
+
+def set_chunk_size(size):
+    """
+    :param size: number of readings parsed at once
+    """
+    global CHUNK_SIZE
+    CHUNK_SIZE = int(size)
+
+
+def __hours_of_year(timestamps):
+    # index into the 8760 hours of the 365-day year, -1 on the 29th of February
+    years = timestamps.astype('datetime64[Y]')
+    minutes = (timestamps - years).astype(np.int64)
+    year = years.astype(np.int64) + 1970
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+
+    day = minutes // 1440
+    hours = (day - (leap & (day > 59))) * 24 + minutes % 1440 // 60
+    hours[leap & (day == 59)] = -1
+    return hours
+
+
+def __last_sunday(years, month):
+    # the last day of the month minus its distance to Sunday, 1970-01-01 was a Thursday
+    last_day = (years.astype('datetime64[M]') + month).astype('datetime64[D]') - np.timedelta64(1, 'D')
+    return last_day - ((last_day.astype(np.int64) + 4) % 7).astype('timedelta64[D]')
+
+
+def __summer_time(timestamps, utc_offset, latest):
+    # the clocks change at 01:00 UTC, the hour after the change in October is read twice
+    years = timestamps.astype('datetime64[Y]')
+    change = np.timedelta64(int(round((1 + utc_offset) * 60)), 'm')
+    begin = __last_sunday(years, 3) + change
+    end = __last_sunday(years, 10) + change
+    hour = np.timedelta64(60, 'm')
+
+    # the second pass of the repeated hour is standard time again
+    previous = np.maximum.accumulate(np.concatenate([[latest], timestamps[:-1]]))
+    repeated = (timestamps >= end) & (timestamps < end + hour) & (timestamps <= previous)
+    return (timestamps >= begin) & (timestamps < end + hour) & ~repeated
+
+
+def __to_utc_plus_one(timestamps, utc_offset, daylight_saving, latest=None):
+    # the timestamps in UTC+1 without daylight saving time, latest is the last wall clock time of the previous blocks
+    converted = timestamps + np.timedelta64(int(round((1 - utc_offset) * 60)), 'm')
+    if daylight_saving:
+        latest = timestamps[0] - np.timedelta64(1, 'm') if latest is None else latest
+        converted = converted - __summer_time(timestamps, utc_offset, latest) * np.timedelta64(60, 'm')
+    return converted
+
+
+def __to_power(values, unit, interval):
+    # mean power of the interval in [W]
+    if unit in __power_units:
+        return values * __power_units[unit]
+    if unit in __energy_units:
+        return values * (__energy_units[unit] * 60 / interval)
+    raise LoadProfileException(f"Unknown unit {unit}!")
+
+
+def __accumulate(sums, counts, timestamps, power):
+    hours = __hours_of_year(timestamps)
+    valid = (hours >= 0) & np.isfinite(power)
+    sums += np.bincount(hours[valid], weights=power[valid], minlength=8760)
+    counts += np.bincount(hours[valid], minlength=8760)
+
+
+def __hourly_profile(sums, counts) -> np.ndarray:
+    measured = counts > 0
+    if not np.any(measured):
+        raise LoadProfileException("The meter data holds no readings!")
+
+    profile = np.empty(8760)
+    profile[measured] = sums[measured] / counts[measured]
+
+    # hours without readings are interpolated between their measured neighbours, around the turn of the year
+    hours = np.arange(8760)
+    profile[~measured] = np.interp(hours[~measured], hours[measured], profile[measured], period=8760)
+    return profile.reshape(365, 24)
+
+
+def __parse_timestamps(column, dayfirst):
+    column = np.char.strip(column)
+    if dayfirst:
+        # reorder the characters of all timestamps at once, the fields have to be zero-padded
+        chars = column.astype('U16').view('U1').reshape(-1, 16)[:, __dayfirst_order]
+        chars[:, [4, 7]] = '-'
+        column = np.ascontiguousarray(chars).view('U16').ravel()
+    try:
+        return column.astype('datetime64[m]')
+    except ValueError as e:
+        raise LoadProfileException(f"Invalid timestamp: {e}")
+
+
+def from_csv(
+        path,
+        unit='kWh',
+        interval=15,
+        timestamp_column=0,
+        value_column=1,
+        delimiter=';',
+        decimal='.',
+        dayfirst=False,
+        label='start',
+        skip_rows=1,
+        encoding='utf-8',
+        utc_offset=1,
+        daylight_saving=False,
+) -> np.ndarray:
+    """
+    Hourly load profile of a meter export with one timestamp and one reading per line, empty readings are missing.
+    :param unit: 'W', 'kW' for mean power or 'Wh', 'kWh' for energy of the readings
+    :param interval: length of the metering interval in [min]
+    :param decimal: decimal separator of the readings
+    :param dayfirst: timestamps are given as 'DD.MM.YYYY HH:MM' instead of ISO 8601
+    :param label: 'start' or 'end', the timestamp marks the start or the end of the interval
+    :param skip_rows: number of header lines
+    :param utc_offset: offset of the timestamps to UTC in [h] without daylight saving time
+    :param daylight_saving: the timestamps are wall clock time with the European summer time, sorted in time
+    :return: numpy array of shape (365, 24) in [W]
+    """
+    shift = np.timedelta64(interval if label == 'end' else 0, 'm')
+    sums, counts = np.zeros(8760), np.zeros(8760)
+    latest = None
+
+    with open(path, encoding=encoding) as file:
+        for _ in range(skip_rows):
+            file.readline()
+        while True:
+            lines = list(itertools.islice(file, CHUNK_SIZE))
+            if not lines:
+                break
+
+            columns = np.loadtxt(
+                lines, dtype=str, delimiter=delimiter, usecols=(timestamp_column, value_column),
+                quotechar='"', comments=None, ndmin=2
+            )
+            readings = np.char.strip(columns[:, 1])
+            if decimal != '.':
+                readings = np.char.replace(np.char.replace(readings, '.', ''), decimal, '.')
+            # empty readings are missing like NaN in binary files
+            readings = np.where(np.char.str_len(readings) == 0, 'nan', readings)
+
+            timestamps = __parse_timestamps(columns[:, 0], dayfirst) - shift
+            converted = __to_utc_plus_one(timestamps, utc_offset, daylight_saving, latest)
+            latest = timestamps.max() if latest is None else max(latest, timestamps.max())
+            try:
+                values = readings.astype(np.float64)
+            except ValueError as e:
+                raise LoadProfileException(f"Invalid reading: {e}")
+            __accumulate(sums, counts, converted, __to_power(values, unit, interval))
+
+    return __hourly_profile(sums, counts)
+
+
+def from_binary(
+        path,
+        start,
+        unit='kWh',
+        interval=15,
+        dtype='<f4',
+        offset=0,
+        label='start',
+        utc_offset=1,
+        daylight_saving=False,
+) -> np.ndarray:
+    """
+    Hourly load profile of consecutive readings stored as a raw binary array or a .npy file.
+    The file is memory mapped and only read block by block, missing readings are NaN.
+    :param start: timestamp of the first reading, e.g. '2022-01-01 00:00'
+    :param unit: 'W', 'kW' for mean power or 'Wh', 'kWh' for energy of the readings
+    :param interval: length of the metering interval in [min]
+    :param dtype: numpy type of the raw readings, the .npy header takes precedence
+    :param offset: header size of the raw file in [bytes]
+    :param label: 'start' or 'end', the timestamp marks the start or the end of the interval
+    :param utc_offset: offset of start to UTC in [h] without daylight saving time
+    :param daylight_saving: start is wall clock time with the European summer time, the readings follow in real time
+    :return: numpy array of shape (365, 24) in [W]
+    """
+    if str(path).endswith('.npy'):
+        readings = np.load(path, mmap_mode='r').ravel()
+    else:
+        readings = np.memmap(path, dtype=dtype, mode='r', offset=offset)
+
+    step = np.timedelta64(interval, 'm')
+    first = np.datetime64(start, 'm') - (step if label == 'end' else 0 * step)
+    first = __to_utc_plus_one(np.array([first]), utc_offset, daylight_saving)[0]
+    sums, counts = np.zeros(8760), np.zeros(8760)
+
+    for begin in range(0, len(readings), CHUNK_SIZE):
+        values = np.asarray(readings[begin:begin + CHUNK_SIZE], dtype=np.float64)
+        timestamps = first + (begin + np.arange(len(values))) * step
+        __accumulate(sums, counts, timestamps, __to_power(values, unit, interval))
+
+    return __hourly_profile(sums, counts)
@@ -3,34 +3,55 @@ import numpy as np
 from .utils import *
 
 
-def __load_h0():
-    days = []
-    path = os.path.dirname(os.path.abspath(__file__))
-    with open(path + '/default_data/h0.txt', newline='') as file:
-        lines = file.readlines()
-        for line in lines:
-            hours_str = line.strip().replace('\t', "").split(';')
-            days.append([float(hourly_load) for hourly_load in hours_str])
-    return days
+__default_data = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'default_data')
 
+# base profiles by name, loaded on first access
+BASE_PROFILES = ('h0', 'g0')
+__base_profiles = {}
 
-#
-# annual: / 1018704.4249999993 [Wh]
-#
-def __load_g0():
+
+def read_base_profile_txt(name) -> np.ndarray:
+    """
+    Parse the text source of a base profile in default_data.
+    """
     days = []
-    path = os.path.dirname(os.path.abspath(__file__))
-    with open(path + '/default_data/g0.txt', newline='') as file:
+    with open(os.path.join(__default_data, name + '.txt'), newline='') as file:
         lines = file.readlines()
         for line in lines:
             hours_str = line.strip().replace('\t', "").split(';')
             days.append([float(hourly_load) for hourly_load in hours_str])
-    return days
+    return np.array(days)
 
 
+def __base_profile(name):
+    if name not in __base_profiles:
+        # the .npy files are compiled from the .txt sources, which remain the fallback
+        try:
+            __base_profiles[name] = np.load(os.path.join(__default_data, name + '.npy'))
+        except OSError:
+            __base_profiles[name] = read_base_profile_txt(name)
+    return __base_profiles[name]
+
+
+def compile_base_profiles() -> None:
+    """
+    Write the .npy files of the base profiles from their .txt sources, run `python -m loadprofile` after editing them.
+    """
+    for name in BASE_PROFILES:
+        np.save(os.path.join(__default_data, name + '.npy'), read_base_profile_txt(name))
+        __base_profiles.pop(name, None)
+
+
+#
+# g0 annual: / 1018704.4249999993 [Wh]
 #
-h0 = __load_h0()
-g0 = __load_g0()
+# base profiles in [W] for 1000 kWh/year, h0: (365 x 24), g0: (9 x 24) rows of (season, day type)
+# they are module attributes profile.h0 and profile.g0, read from default_data on first access
+def __getattr__(name):
+    if name in BASE_PROFILES:
+        return __base_profile(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # stromspiegel 21/22
 scale_stromspiegel_h0 = {
@@ -94,7 +115,7 @@ def get_usage(usage: str):
 
 
 def scale(ls, scalar):
-    return [ls[i] * scalar for i in range(len(ls))]
+    return (np.asarray(ls) * scalar).tolist()
 
 
 # ls 2 dm array (h0, g0)
@@ -107,27 +128,35 @@ def shift_by_hour(ls, hour):
     return res
 
 
-def by_day_of_year(
-        day_num,
+def __g0_row(day_num):
+    day_of_week = day_num % 7
+    if day_of_week > 1:
+        day_of_week = 2
+    # Winter
+    if day_num > 305 or day_num < 79:
+        return day_of_week
+    # Summer
+    elif 135 < day_num < 257:
+        return 3 + day_of_week
+    # transitional season
+    return 6 + day_of_week
+
+
+# row of g0 for every day of the year
+g0_rows = np.array([__g0_row(d) for d in range(365)])
+
+
+def get_scaling(
         profile=ProfileType.Residential,
         number_of_residents=1,
         building_type=ResidentialBuildingType.House,
         is_warm_water_electric=False,
         rating=ResidentialRating.D,
-        area=None,
-        shift=0
-):
+        area=None
+) -> float:
     """
-    prfile: ProfileType. [Residential, Commercial]
-    rating: ResidentialRating. [A..G] | integer or float in (kWh/year)
-    for Residential: parameters: num_people, building_type, warm_water_electrical, rating (class)
-    for Commercial: parameters: area, building_type
-    building type:
-    Residential:  ResidentialBuildingType. [House, Apartment]
-    Commercial:   office, hotel_garni, retailer, workshop, production_site, commercial_nonfood
-    for both: usage (int, float) [kWh/year]
+    Factor of the base profile (h0 or g0) for the given household or business, see by_day_of_year.
     """
-
     number_of_residents = min(number_of_residents, 6)
 
     # household
@@ -139,37 +168,77 @@ def by_day_of_year(
         if is_warm_water_electric:
             warm_water = 'mitStrom'
 
-        return scale(shift_by_hour(h0, shift)[day_num], scale_stromspiegel_h0[building_type][warm_water][number_of_residents - 1][rating] / 1000)
+        return scale_stromspiegel_h0[building_type][warm_water][number_of_residents - 1][rating] / 1000
 
     elif profile == ProfileType.Residential and type(rating) in [float, int]:
-        return scale(shift_by_hour(h0, shift)[day_num], rating / 1000)
+        return rating / 1000
 
     # Gewerbe Allgemein
-    if profile == ProfileType.Commercial:
-        day_of_week = day_num % 7
-        if day_of_week > 1:
-            day_of_week = 2
-        # Winter
-        if day_num > 305 or day_num < 79:
-            res = g0[day_of_week]
-        # Summer
-        elif 135 < day_num < 257:
-            res = g0[3 + day_of_week]
-        # transitional season
-        else:
-            res = g0[6 + day_of_week]
-
-    else:
+    if profile != ProfileType.Commercial:
         raise UnknownLoadProfileType(f"Unknown load profile type: {profile}!")
 
     if type(rating) in [float, int]:
-        res = scale(res, rating / 1018.7044245)
+        return rating / 1018.7044245
     elif area is not None and type(rating) == str:
-        res = scale(res, (stromspiegel_g0_per_m2[rating] * area)/1018.7044245)
+        return (stromspiegel_g0_per_m2[rating] * area)/1018.7044245
     else:
         raise LoadProfileException(f"Area is not defined!")
 
-    return res
+
+def by_year(
+        profile=ProfileType.Residential,
+        number_of_residents=1,
+        building_type=ResidentialBuildingType.House,
+        is_warm_water_electric=False,
+        rating=ResidentialRating.D,
+        area=None,
+        shift=0
+) -> np.ndarray:
+    """
+    Scaled and shifted load profile of the whole year, parameters as for by_day_of_year.
+    :return: numpy array of shape (365, 24) in [W]
+    """
+    factor = get_scaling(profile, number_of_residents, building_type, is_warm_water_electric, rating, area)
+
+    if profile == ProfileType.Residential:
+        base = __base_profile('h0')
+        if shift != 0:
+            base = np.roll(base.ravel(), shift).reshape(base.shape)
+    else:
+        base = __base_profile('g0')[g0_rows]
+
+    return base * factor
+
+
+def by_day_of_year(
+        day_num,
+        profile=ProfileType.Residential,
+        number_of_residents=1,
+        building_type=ResidentialBuildingType.House,
+        is_warm_water_electric=False,
+        rating=ResidentialRating.D,
+        area=None,
+        shift=0
+):
+    """
+    prfile: ProfileType. [Residential, Commercial]
+    rating: ResidentialRating. [A..G] | integer or float in (kWh/year)
+    for Residential: parameters: num_people, building_type, warm_water_electrical, rating (class)
+    for Commercial: parameters: area, building_type
+    building type:
+    Residential:  ResidentialBuildingType. [House, Apartment]
+    Commercial:   office, hotel_garni, retailer, workshop, production_site, commercial_nonfood
+    for both: usage (int, float) [kWh/year]
+    """
+    factor = get_scaling(profile, number_of_residents, building_type, is_warm_water_electric, rating, area)
+
+    if profile == ProfileType.Residential:
+        # hours of the day in the base profile rolled by shift
+        h0 = __base_profile('h0')
+        hours = (np.arange(24) + day_num * 24 - shift) % h0.size
+        return scale(h0.ravel()[hours], factor)
+
+    return scale(__base_profile('g0')[g0_rows[day_num]], factor)
 
 
 #
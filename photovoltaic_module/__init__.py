@@ -1,2 +1,3 @@
 from .simple_efficiency import SimpleEfficiencyModel, PhotovoltaicModel
-from .utils import load_simple_models
\ No newline at end of file
+from .single_diode import SingleDiodeModel
+from .utils import load_simple_models
@@ -20,31 +20,15 @@ class PhotovoltaicModel:
             PhotovoltaicModel.default_panel_width
         self.height = specs['height'] if 'height' in specs.keys() else \
             PhotovoltaicModel.default_panel_height
-
-    def get_mpp(self, t: float, g: float, vw: float) -> float:
-        raise UndefinedPhotovoltaicModelException("The model has to be a valid Photovoltaic model!")
-
-
-# this is a valid model
-class SimpleEfficiencyModel(PhotovoltaicModel):
-    def __init__(self, specs: dict, num_panels=1):
-        super(SimpleEfficiencyModel, self).__init__(specs)
-        self.mu_p = specs['mu_mpp'] * 1e-2
-        self.num_panels = num_panels
-        self.t_ref = specs['T_ref'] if 'T_ref' in specs.keys() else 298.15
         self.t_noct = specs['T_NOCT'] if 'T_NOCT' in specs.keys() else 273.15 + 41
 
-
-        #
+        # Sandia cell temperature model
         self.sandia_params = {
             'a': -3.56,
             'b': -0.075,
             'dt': 3
         }
 
-    def get_mpp_iv(self, t, g):
-        return self.mpp_ref * g / 1000 * (1 + self.mu_p * (t - self.t_ref)), 1
-
     def get_cell_t(self, t_amb, g, vw=0, method="sandia"):
         if method == "sandia":
             return t_amb + g * (
@@ -55,6 +39,29 @@ class SimpleEfficiencyModel(PhotovoltaicModel):
         return t_amb + (self.t_noct - celsius2kelvin(20)) / 0.8 * g / 1000
 
     def get_mpp(self, t, g, vw):
+        """
+        Maximum power point of one panel, all arguments are scalars or numpy arrays that broadcast together.
+        :param t: ambient temperature in [°C]
+        :param g: irradiance on the panel in [W/m²]
+        :param vw: wind speed in [m/s]
+        :return: power in [W] of the broadcast shape
+        """
+        raise UndefinedPhotovoltaicModelException("The model has to be a valid Photovoltaic model!")
+
+
+# this is a valid model
+class SimpleEfficiencyModel(PhotovoltaicModel):
+    def __init__(self, specs: dict, num_panels=1):
+        super(SimpleEfficiencyModel, self).__init__(specs)
+        self.mu_p = specs['mu_mpp'] * 1e-2
+        self.num_panels = num_panels
+        self.t_ref = specs['T_ref'] if 'T_ref' in specs.keys() else 298.15
+
+    def get_mpp_iv(self, t, g):
+        return self.mpp_ref * g / 1000 * (1 + self.mu_p * (t - self.t_ref)), 1
+
+    def get_mpp(self, t, g, vw):
+        t, g, vw = np.asarray(t), np.asarray(g), np.asarray(vw)
         cell_temperature = self.get_cell_t(273.15 + t, g, vw)
         v, i = self.get_mpp_iv(cell_temperature, g)
         return v * i
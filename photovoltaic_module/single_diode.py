@@ -0,0 +1,107 @@
+"""
+Single diode model
+Source: W. De Soto et al., Improvement and validation of a model for photovoltaic array performance,
+Solar Energy 80 (2006) 78-88
+
+The maximum power point is searched along the diode voltage (Bishop 1988), where current and voltage
+of the equivalent circuit are explicit. Newton's method on dP/dV_d runs on whole arrays of hours at once.
+"""
+
+from .utils import *
+from .simple_efficiency import PhotovoltaicModel
+import warnings
+import numpy as np
+
+
+class SingleDiodeModel(PhotovoltaicModel):
+    """
+    Parameters at reference conditions (1000 W/m², T_ref), e.g. from the CEC module database:
+    I_L_ref: light current [A], I_o_ref: diode saturation current [A], R_s: series resistance [Ohm],
+    R_sh_ref: shunt resistance [Ohm], a_ref: modified ideality factor n * N_s * k * T_ref / q [V],
+    alpha_sc: temperature coefficient of the short circuit current [A/K]
+    """
+    max_iterations = 50
+    tolerance = 1e-9
+
+    def __init__(self, specs: dict, num_panels=1):
+        self.i_l_ref = specs['I_L_ref']
+        self.i_o_ref = specs['I_o_ref']
+        self.r_s = specs['R_s']
+        self.r_sh_ref = specs['R_sh_ref']
+        self.a_ref = specs['a_ref']
+        self.alpha_sc = specs['alpha_sc']
+        self.eg_ref = specs['EgRef'] if 'EgRef' in specs.keys() else 1.121
+        self.d_eg_dt = specs['dEgdT'] if 'dEgdT' in specs.keys() else -0.0002677
+        self.t_ref = specs['T_ref'] if 'T_ref' in specs.keys() else 298.15
+        self.num_panels = num_panels
+
+        # the power at reference conditions follows from the circuit parameters
+        if 'mpp' not in specs.keys():
+            v, i = self.get_mpp_iv(self.t_ref, 1000)
+            specs = dict(specs, mpp=float(v * i))
+        super(SingleDiodeModel, self).__init__(specs)
+
+    def get_parameters(self, t, g):
+        """
+        Circuit parameters at the cell temperature t in [K] and the irradiance g in [W/m²].
+        :return: light current, saturation current, series resistance, shunt resistance, modified ideality factor
+        """
+        k = boltzmann() / charge_of_electron()      # [eV/K]
+        e_g = self.eg_ref * (1 + self.d_eg_dt * (t - self.t_ref))
+
+        i_l = g / 1000 * (self.i_l_ref + self.alpha_sc * (t - self.t_ref))
+        i_o = self.i_o_ref * (t / self.t_ref)**3 * np.exp(self.eg_ref / (k * self.t_ref) - e_g / (k * t))
+        with np.errstate(divide='ignore'):
+            r_sh = self.r_sh_ref * 1000 / g
+        a = self.a_ref * t / self.t_ref
+        return i_l, i_o, self.r_s, r_sh, a
+
+    def get_mpp_iv(self, t, g):
+        """
+        Voltage and current at the maximum power point, zero without irradiance.
+        :param t: cell temperature in [K]
+        :param g: irradiance in [W/m²]
+        """
+        t, g = np.broadcast_arrays(np.asarray(t, dtype=np.float64), np.asarray(g, dtype=np.float64))
+        lit = g > 0
+        v_mpp, i_mpp = np.zeros(t.shape), np.zeros(t.shape)
+
+        i_l, i_o, r_s, r_sh, a = self.get_parameters(t[lit], g[lit])
+
+        # open circuit voltage without shunt losses as the starting point, the power is concave below it
+        v_d = a * np.log1p(i_l / i_o)
+        for _ in range(self.max_iterations):
+            exp_term = i_o / a * np.exp(v_d / a)
+
+            i = i_l - a * exp_term + i_o - v_d / r_sh
+            di = -exp_term - 1 / r_sh
+            d2i = -exp_term / a
+
+            v = v_d - i * r_s
+            dv = 1 - di * r_s
+            d2v = -d2i * r_s
+
+            dp = di * v + i * dv
+            d2p = d2i * v + 2 * di * dv + i * d2v
+
+            step = dp / d2p
+            v_d = v_d - step
+            if np.all(np.abs(step) < self.tolerance):
+                break
+        else:
+            warnings.warn(
+                f"Maximum power point did not converge after {self.max_iterations} iterations "
+                f"for {np.count_nonzero(~(np.abs(step) < self.tolerance))} of {step.size} values, "
+                f"last step {np.abs(step).max():.3g} V", RuntimeWarning
+            )
+
+        i = i_l - i_o * np.expm1(v_d / a) - v_d / r_sh
+        v_mpp[lit] = v_d - i * r_s
+        i_mpp[lit] = i
+        return v_mpp[()], i_mpp[()]
+
+    def get_mpp(self, t, g, vw):
+        t, g, vw = np.asarray(t), np.asarray(g), np.asarray(vw)
+        cell_temperature = self.get_cell_t(273.15 + t, g, vw)
+        v, i = self.get_mpp_iv(cell_temperature, g)
+        return v * i
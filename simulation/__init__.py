@@ -1,2 +1,3 @@
 from .interface import Simulation, SimulationParams
 from ._simulation import simulate
+from .catalog import CatalogEvaluation
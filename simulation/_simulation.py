@@ -36,41 +36,42 @@ def get_p_max(p_maxs, panels_per_surface) -> np.array:
 
 
 def get_energy_yield_c0(p_load, p_balance):
-    energy_yield_c0 = np.array([
-        [-p if p < 0 else 0 for p in p_day] for p_day in p_balance
-    ])
+    # the load not covered by the PV output
+    energy_yield_c0 = np.where(p_balance < 0, -p_balance, 0)
     energy_to_load = p_load - energy_yield_c0
     return energy_to_load
 
 
-def get_energy_distributions(energy_balance, num_classes=100):
-    surplus_daily_energy = [sum([energy for energy in day if energy >= 0]) for day in energy_balance]
-    deficit_daily_energy = [sum([energy for energy in day if energy < 0]) for day in energy_balance]
+# probability of k days out of 365, summed up day by day like the reference loop
+__day_probabilities = np.concatenate([[0], np.cumsum(np.full(365, 1/365))])
 
-    max_surplus = max(surplus_daily_energy)
-    max_deficit = -min(deficit_daily_energy)
 
-    surplus_distribution = [0 for _ in range(num_classes)]
-    surplus_classes = [max_surplus * (i + 0.3) / num_classes for i in range(num_classes)]
+def __get_distribution(daily_energy, num_classes):
+    max_energy = daily_energy.max()
+    floors = max_energy * np.arange(num_classes) / num_classes
+    ceils = max_energy * np.arange(1, num_classes + 1) / num_classes
 
-    deficit_distribution = [0 for _ in range(num_classes)]
-    deficit_classes = [max_deficit * (i + 0.3) / num_classes for i in range(num_classes)]
+    # a day counts in every class whose range [floor, ceil + 1) contains it, (classes x days)
+    in_class = (floors[:, None] <= daily_energy) & (daily_energy < ceils[:, None] + 1)
+    distribution = __day_probabilities[np.count_nonzero(in_class, axis=1)]
+    classes = max_energy * (np.arange(num_classes) + 0.3) / num_classes
+    return distribution, classes
 
-    for class_num in range(num_classes):
-        floor_energy_surplus = max_surplus * class_num / num_classes
-        ceil_energy_surplus = max_surplus * (class_num+1) / num_classes
 
-        floor_energy_deficit = max_deficit * class_num / num_classes
-        ceil_energy_deficit = max_deficit * (class_num+1) / num_classes
+def get_energy_distributions(energy_balance, num_classes=100):
+    """
+    Distributions of the daily surplus and deficit energy in num_classes classes of equal width.
+    :param energy_balance: hourly energy balance of shape (365, 24) in [Wh]
+    :return: numpy arrays of the probabilities and energies in [Wh] of the surplus and deficit classes
+    """
+    energy_balance = np.asarray(energy_balance, dtype=np.float64)
 
-        for day in range(365):
-            # surplus
-            if floor_energy_surplus <= surplus_daily_energy[day] < ceil_energy_surplus+1:
-                surplus_distribution[class_num] += 1/365
+    # cumulative sums add the hours in order, like summing the day in python
+    surplus_daily_energy = np.cumsum(np.where(energy_balance >= 0, energy_balance, 0), axis=1)[:, -1]
+    deficit_daily_energy = np.cumsum(np.where(energy_balance < 0, energy_balance, 0), axis=1)[:, -1]
 
-            # deficit
-            if floor_energy_deficit <= -deficit_daily_energy[day] < ceil_energy_deficit+1:
-                deficit_distribution[class_num] += 1/365
+    surplus_distribution, surplus_classes = __get_distribution(surplus_daily_energy, num_classes)
+    deficit_distribution, deficit_classes = __get_distribution(-deficit_daily_energy, num_classes)
 
     return surplus_distribution, surplus_classes, deficit_distribution, deficit_classes
 
@@ -138,15 +139,6 @@ def simulate(
                                c_nom / 1000 + \
                                simulation.params.additional_costs
 
-
-
-    # flatten variables
-    simulation.result.p_dc_hourly = simulation.result.p_dc_hourly.flatten().tolist()
-    print(simulation.result.p_dc_hourly )
-    simulation.result.p_ac_hourly = simulation.result.p_ac_hourly.flatten().tolist()
-    simulation.result.p_pv2load_hourly = simulation.result.p_pv2load_hourly.flatten().tolist()
-    simulation.result.p_balance_hourly = simulation.result.p_balance_hourly.flatten().tolist()
-
     simulation.result.annual_costs_with_system = simulation.p_load.sum()/1000 * simulation.result.lcoe
     simulation.result.annual_savings = simulation.p_load.sum()/1000 * simulation.params.cost_kwh_grid - simulation.result.net_annual_bill_annually
     simulation.result.return_on_investment = simulation.result.annual_savings / simulation.result.equity
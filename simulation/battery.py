@@ -1,3 +1,4 @@
+import numpy as np
 import battery
 from .interface import Simulation
 
@@ -83,9 +84,9 @@ def simulate_battery(c_nom: float, simulation: Simulation) -> None:
     grid_compensation_total = sum(grid_compensation_month_adjusted)
     energy_pv2grid_annually = sum(grid_meter_sell_month)
 
-    simulation.result.bat_soc_hourly = [x / bat.c_nom * 100 for x in bat_charge_ls] if bat.c_nom > 0 else None
+    simulation.result.bat_soc_hourly = np.array(bat_charge_ls) / bat.c_nom * 100 if bat.c_nom > 0 else None
 
-    simulation.result.p_bat2load_hourly = [i for i in bat_to_load_ls]
+    simulation.result.p_bat2load_hourly = np.array(bat_to_load_ls)
     simulation.result.energy_pv2grid_annually = energy_pv2grid_annually/1000
     simulation.result.grid_compensation_total = grid_compensation_total
     simulation.result.energy_bess2load_annually = bat.discharged/1000
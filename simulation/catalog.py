@@ -0,0 +1,96 @@
+"""
+Evaluation of a whole panel catalog on one building.
+
+The building, its weather profile and the irradiance on its surfaces are shared by all panels.
+Layouts are only fitted once per distinct panel size, and the hourly output of all panels is
+computed in one pass as a (models x surfaces x 365 x 24) array.
+"""
+
+import copy
+import numpy as np
+
+import weather
+from photovoltaic_module import PhotovoltaicModel, SimpleEfficiencyModel
+from .interface import SimulationParams, get_site
+
+
+def stack_models(panels: list) -> SimpleEfficiencyModel:
+    """
+    One SimpleEfficiencyModel whose parameters are arrays of shape (models, 1, 1),
+    its get_mpp broadcasts over the catalog and (surfaces x hours) inputs.
+    """
+    stacked = copy.copy(panels[0])
+    for name in ('mpp_ref', 'cost', 'width', 'height', 'mu_p', 'num_panels', 't_ref', 't_noct'):
+        setattr(stacked, name, np.array([getattr(panel, name) for panel in panels]).reshape(-1, 1, 1))
+    stacked.sandia_params = {
+        name: np.array([panel.sandia_params[name] for panel in panels]).reshape(-1, 1, 1)
+        for name in panels[0].sandia_params
+    }
+    return stacked
+
+
+def get_catalog_output(panels: list, irradiance, weather_profile: weather.WeatherData) -> np.ndarray:
+    """
+    Maximum output of one panel of every model on every surface, only the daylight hours are evaluated.
+    :param irradiance: hourly irradiance on the surfaces, (surfaces x hours)
+    :return: numpy array of shape (models, surfaces, 365, 24) in [W]
+    """
+    irradiance = np.atleast_2d(irradiance)
+    hours = weather_profile.daylight_hours
+
+    t = weather_profile.temperature[hours]
+    g = irradiance[:, hours]
+    vw = weather_profile.wind_speed[hours]
+
+    if all(type(panel) is SimpleEfficiencyModel for panel in panels):
+        power = stack_models(panels).get_mpp(t=t, g=g, vw=vw)
+    else:
+        power = np.stack([panel.get_mpp(t=t, g=g, vw=vw) for panel in panels])
+
+    return weather_profile.scatter(power).reshape(len(panels), irradiance.shape[0], 365, 24)
+
+
+class CatalogEvaluation:
+    """
+    max_panels_per_surface: number of panels of each model fitting on each surface, (models x surfaces)
+    p_maxs: hourly output of one panel of each model on each surface in [W], (models x surfaces x 365 x 24)
+    annual_energy: DC output of each model with all surfaces fully covered in [kWh]
+    """
+    def __init__(
+            self,
+            address: str,
+            panels: list,
+            params: SimulationParams,
+            minute_modifier=+0.5,
+    ):
+        self.address = address
+        self.panels = panels
+        self.params = params
+
+        site = get_site(address, panels, params, minute_modifier=minute_modifier)
+        self.zip_code = site.zip_code
+        self.layouts = site.layouts
+        self.roof_df = next(iter(self.layouts.values()))
+        self.max_panels_per_surface = np.array([
+            self.layouts[(panel.width, panel.height)]['max_num_panels'].to_numpy() for panel in panels
+        ])
+
+        self.weather = site.weather
+
+        # the surfaces are the same for all layouts, (surfaces x hours)
+        self.incident_irradiance = site.incident_irradiance
+
+        self.p_maxs = get_catalog_output(panels, self.incident_irradiance, self.weather)
+
+        self.annual_energy = np.einsum('ms,mstd->m', self.max_panels_per_surface, self.p_maxs) / 1000
+
+    def get_best_panel(self, per_cost=False) -> PhotovoltaicModel:
+        """
+        :param per_cost: rank by annual energy per cost of the panels instead of by annual energy
+        :return: the panel with the highest annual energy on the fully covered roof
+        """
+        score = self.annual_energy
+        if per_cost:
+            cost = np.array([panel.cost for panel in self.panels]) * self.max_panels_per_surface.sum(axis=1)
+            score = np.divide(score, cost, out=np.zeros_like(score), where=cost > 0)
+        return self.panels[int(np.argmax(score))]
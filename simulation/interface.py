@@ -1,3 +1,4 @@
+from collections import namedtuple
 import numpy as np
 
 import cadaster
@@ -7,19 +8,27 @@ import loadprofile
 
 
 def get_pv_maximum_output(
-        irradiance: list,                       # list of hourly irradiance on tilted surface, list per surface
+        irradiance,                             # hourly irradiance on tilted surface, (hours) or (surfaces x hours)
         weather_profile: weather.WeatherData,
         panel: PhotovoltaicModel,
-        roof_index: int
-):
+        roof_index: int,
+        daylight_only=False                     # the output is zero without irradiance, skip the night hours
+) -> np.ndarray:
+    """
+    Maximum output of one panel for every hour, evaluated on whole arrays.
+    :return: numpy array of shape (365, 24) or (surfaces, 365, 24) in [W]
+    """
+    irradiance = np.asarray(irradiance)
+    hours = weather_profile.daylight_hours if daylight_only else slice(None)
 
-    daily_power = [[panel.get_mpp(
-        t=weather_profile.temperature[day * 24 + hour],
-        g=irradiance[day * 24 + hour],
-        vw=weather_profile.wind_speed[day * 24 + hour]
-    ) for hour in range(24)] for day in range(365)]
+    hourly_power = np.zeros(irradiance.shape)
+    hourly_power[..., hours] = panel.get_mpp(
+        t=weather_profile.temperature[hours],
+        g=irradiance[..., hours],
+        vw=weather_profile.wind_speed[hours]
+    )
 
-    return daily_power
+    return hourly_power.reshape(irradiance.shape[:-1] + (365, 24))
 
 
 class FrozenClass(object):
@@ -36,12 +45,13 @@ class FrozenClass(object):
 
 class SimulationResult(FrozenClass):
     """
-    p_dc_hourly: DC output of the PV array in aKn hourly format in [Wh]
-    p_ac_hourly: AC output of the PV array in an hourly format in [Wh]
-    p_pv2load_hourly: AC power delivered to the load by the PV in an hourly format in [Wh]
-    p_balance_hourly: AC power balance in an hourly format [Wh]
+    p_dc_hourly: DC output of the PV array in an hourly format (365 x 24) in [Wh]
+    p_ac_hourly: AC output of the PV array in an hourly format (365 x 24) in [Wh]
+    p_pv2load_hourly: AC power delivered to the load by the PV in an hourly format (365 x 24) in [Wh]
+    p_balance_hourly: AC power balance in an hourly format (365 x 24) [Wh]
     p_bat2load_hourly: AC power delivered to the load by the BESS in an hourly format in [Wh]
 
+    The hourly results are numpy arrays, as_lists() converts them for the validation against references.
     """
     def __init__(self):
         self.p_dc_hourly = None
@@ -90,6 +100,15 @@ class SimulationResult(FrozenClass):
 
         self._freeze()
 
+    def as_lists(self) -> dict:
+        """
+        :return: dict of all results like vars(), hourly arrays flattened to lists
+        """
+        return {
+            key: value.ravel().tolist() if isinstance(value, np.ndarray) else value
+            for key, value in vars(self).items() if not key.startswith('_')
+        }
+
 
 class SimulationParams:
     def __init__(
@@ -130,50 +149,73 @@ class SimulationParams:
         self.shadow_offset = 0
 
 
+Site = namedtuple('Site', ['zip_code', 'layouts', 'weather', 'incident_irradiance'])
+
+
+def get_site(address: str, panels: list, params: SimulationParams, minute_modifier=+0.5) -> Site:
+    """
+    Roof surfaces, weather profile and irradiance on the surfaces of the building at the address.
+    :param panels: panels whose layouts are fitted, once per distinct panel size
+    :return: Site with the layouts as roof surfaces by (panel width, panel height)
+    and the hourly irradiance on the surfaces (surfaces x hours), equal for all layouts
+    """
+    zip_code = address.split(',')[1].strip().split(' ')[0]
+    building = cadaster.by_address(address)
+
+    layouts = {}
+    for panel in panels:
+        if (panel.width, panel.height) not in layouts:
+            layouts[(panel.width, panel.height)] = cadaster.get_surfaces_info(
+                building=building,
+                panel_width=panel.width,
+                panel_height=panel.height,
+                min_inclination=15,
+                max_inclination=45,
+                shadow_offset=params.shadow_offset
+            )
+
+    weather_profile = weather.by_zip_code(zip_code, minute_modifier=minute_modifier)
+
+    # get incident radiation on all surfaces at once, (surfaces x hours)
+    # surfaces of equal slope and orientation are computed once and reused across simulations
+    roof_df = next(iter(layouts.values()))
+    incident_irradiance = weather.irradiance_cache.by_surfaces(
+        weather_profile,
+        inclinations=roof_df['slope'].to_numpy(),
+        azimuths=roof_df['orientation'].to_numpy(),
+        albedo=0.2,
+        diffuse_model=params.diffuse_model,
+        daylight_only=True
+    )
+
+    return Site(zip_code, layouts, weather_profile, incident_irradiance)
+
+
 class Simulation:
     def __init__(
             self,
             address: str,
             panel: PhotovoltaicModel,
-            load_profile: dict,
+            load_profile,
             params: SimulationParams,
             minute_modifier=+0.5,
     ):
+        """
+        :param load_profile: parameters of loadprofile.by_year, or a measured (365 x 24) profile in [W],
+        e.g. of loadprofile.meter
+        """
         self.result = SimulationResult()
         self.address = address
-        self.zip_code = address.split(',')[1].strip().split(' ')[0]
         self.panel = panel
         self.params = params
 
-        building = cadaster.by_address(address)
+        site = get_site(address, [panel], params, minute_modifier=minute_modifier)
+        self.zip_code = site.zip_code
+        self.roof_df = site.layouts[(panel.width, panel.height)]
+        self.weather = site.weather
 
-        self.roof_df = cadaster.get_surfaces_info(
-            building=building,
-            panel_width=panel.width,
-            panel_height=panel.height,
-            min_inclination=15,
-            max_inclination=45,
-            shadow_offset=params.shadow_offset
-        )
-
-        self.weather = weather.by_zip_code(self.zip_code, minute_modifier=minute_modifier)
-
-        # get incident radiation on each surface
-        annual_irradiance = []
-        incident_irradiance = []
-
-        for index, row in self.roof_df.iterrows():
-            irradiance = weather.get_incident_radiation(
-                self.weather,
-                inclination=row['slope'],
-                azimuth=row['orientation'],
-                albedo=0.2,
-                diffuse_model=self.params.diffuse_model,
-                roof_index=index
-            )
-
-            annual_irradiance.append(sum(irradiance))
-            incident_irradiance.append(irradiance)
+        incident_irradiance = site.incident_irradiance
+        annual_irradiance = incident_irradiance.sum(axis=1)
 
         self.roof_df = self.roof_df.assign(annual_irradiance=annual_irradiance)
 
@@ -183,24 +225,16 @@ class Simulation:
         )
         self.max_panels_per_surface = self.roof_df['max_num_panels'].tolist()
 
-        # maximum power by surface for one panel
-        self.p_maxs = np.array([
-            get_pv_maximum_output(
-                irradiance=incident_irradiance[i],
-                weather_profile=self.weather,
-                panel=panel,
-                roof_index=i
-            )
-            for i in range(len(incident_irradiance))
-        ])
-
-        self.p_load = np.array([
-            loadprofile.by_day_of_year(
-                day_num=d,
-                **load_profile
-            )
-            for d in range(365)
-        ])
-
-
+        # maximum power by surface for one panel, (surfaces x 365 x 24)
+        self.p_maxs = get_pv_maximum_output(
+            irradiance=incident_irradiance,
+            weather_profile=self.weather,
+            panel=panel,
+            roof_index=None,
+            daylight_only=True
+        )
 
+        if isinstance(load_profile, dict):
+            self.p_load = loadprofile.by_year(**load_profile)
+        else:
+            self.p_load = np.asarray(load_profile, dtype=np.float64).reshape(365, 24)
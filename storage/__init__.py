@@ -0,0 +1 @@
+# persistent files shared between processes, kept free of imports so the weather and sun position core stay light
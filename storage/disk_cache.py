@@ -0,0 +1,144 @@
+"""
+Persistent cache of numpy arrays on disk.
+
+Every entry is a ``.npz`` file named after the hash of its key, so processes computing the same
+key address the same file. Entries are written under a temporary name and replaced atomically,
+concurrent writers of a key produce the same content and readers never see partial files.
+Once the entries exceed the size bound, the least recently used ones are removed.
+A cache without a path is disabled, it stores nothing and misses every key.
+"""
+
+import os
+import hashlib
+import tempfile
+import zipfile
+from collections import namedtuple
+import numpy as np
+from .files import set_default_permissions
+
+
+# the caches of the package live under its data folder like the DWD dataset, independent of the working directory
+CACHE_ROOT = os.path.join(os.path.split(os.path.split(os.path.abspath(__file__))[0])[0], 'data', 'cache')
+
+
+def get_cache_path(name: str) -> str:
+    return os.path.join(CACHE_ROOT, name)
+
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'evictions', 'entries', 'current_bytes', 'max_bytes'])
+
+
+class DiskCache:
+    def __init__(self, path, max_bytes=256 * 2**20, version=1):
+        # folder of the entries, None disables the cache
+        self.path = path
+        self.max_bytes = max_bytes
+        # bumped by the owner whenever the content of the entries changes
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_entry_path(self, key) -> str:
+        digest = hashlib.sha256(repr((self.version, key)).encode('utf-8')).hexdigest()
+        return os.path.join(self.path, digest + '.npz')
+
+    def get(self, key):
+        """
+        :return: dict of arrays stored for the key, or None if there is no entry
+        """
+        if self.path is None:
+            return None
+        entry_path = self.get_entry_path(key)
+        try:
+            with np.load(entry_path) as entry:
+                arrays = {name: entry[name] for name in entry.files}
+        except (OSError, ValueError, zipfile.BadZipFile):
+            # missing, or removed by another process while reading
+            self.misses += 1
+            return None
+
+        # the modification time orders the entries for eviction
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+        self.hits += 1
+        return arrays
+
+    def put(self, key, arrays: dict, evict=True) -> None:
+        """
+        :param evict: False defers the eviction to a later evict() after several puts
+        """
+        if self.path is None:
+            return
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=self.path, prefix='.tmp_', suffix='.npz')
+            try:
+                with os.fdopen(fd, 'wb') as file:
+                    np.savez(file, **arrays)
+                # readable by the workers of other users
+                set_default_permissions(temp_path)
+                os.replace(temp_path, self.get_entry_path(key))
+            except BaseException:
+                os.remove(temp_path)
+                raise
+        except OSError:
+            # a read-only or full cache folder only costs a recomputation
+            return
+        if evict:
+            self.evict()
+
+    def resize(self, max_bytes) -> None:
+        self.max_bytes = max_bytes
+        self.evict()
+
+    def clear(self) -> None:
+        for _, _, entry_path in self._entries():
+            try:
+                os.remove(entry_path)
+            except OSError:
+                pass
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def info(self) -> CacheInfo:
+        entries = self._entries()
+        return CacheInfo(
+            self.hits, self.misses, self.evictions, len(entries), sum(size for _, size, _ in entries), self.max_bytes
+        )
+
+    def _entries(self) -> list:
+        # (mtime, size, path) of all complete entries, temporary files of running writers are skipped
+        entries = []
+        if self.path is None:
+            return entries
+        try:
+            with os.scandir(self.path) as it:
+                for file in it:
+                    if not file.name.endswith('.npz') or file.name.startswith('.tmp_'):
+                        continue
+                    try:
+                        stat = file.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime_ns, stat.st_size, file.path))
+        except OSError:
+            pass
+        return entries
+
+    def evict(self) -> None:
+        entries = sorted(self._entries())
+        current_bytes = sum(size for _, size, _ in entries)
+        for _, size, entry_path in entries:
+            if current_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(entry_path)
+                self.evictions += 1
+            except OSError:
+                # already evicted by another process
+                pass
+            current_bytes -= size
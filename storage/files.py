@@ -0,0 +1,20 @@
+"""
+Files shared between the processes of several users.
+"""
+
+import os
+
+
+def get_umask() -> int:
+    # the umask can only be read by replacing it
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+def set_default_permissions(path, directory=False) -> None:
+    """
+    mkstemp and mkdtemp create files and folders only their owner can read,
+    give them the permissions of open() and os.mkdir under the current umask instead.
+    """
+    os.chmod(path, (0o777 if directory else 0o666) & ~get_umask())
@@ -1 +1,3 @@
-from .nrel_spa import by_hour_of_year
\ No newline at end of file
+from .nrel_spa import by_hour_of_year, by_hours_of_year
+from .nrel_spa import disk_cache
+from . import spa
@@ -1,15 +1,15 @@
 import ctypes
 import os
-
-
-__day_in_month = [31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
+import numpy as np
+from storage.disk_cache import DiskCache, get_cache_path
+from .spa import DAYS_IN_MONTH, refraction_correction
 
 
 def get_month(n):
-    for m in range(len(__day_in_month)):
-        if __day_in_month[m] -n > 0:
+    for m in range(len(DAYS_IN_MONTH)):
+        if DAYS_IN_MONTH[m] -n > 0:
             return m
-        n -= __day_in_month[m]
+        n -= DAYS_IN_MONTH[m]
 
 
 def get_day_month(day_year):
@@ -17,41 +17,10 @@ def get_day_month(day_year):
     elapsed_days = 1
     month = get_month(day_year-1)
     for i in range(month):
-        elapsed_days += __day_in_month[i]
+        elapsed_days += DAYS_IN_MONTH[i]
     return day_year - elapsed_days + 1
 
 
-def get_hourly_sunpos_spa(year, minute,
-                          lat, lon, timezone,
-                          site_elev, pressure, temp, tilt, azm_rotation):
-
-    path = "/".join(os.path.abspath(__file__).split("\\")[:-1] + ['nrel_spa.dll'])
-    c_lib = ctypes.CDLL(path)
-
-    year = ctypes.c_int32(year)
-    minute = ctypes.c_double(minute)
-    lat = ctypes.c_double(lat)
-    lon = ctypes.c_double(lon)
-    timezone = ctypes.c_double(timezone)
-    site_elev = ctypes.c_double(site_elev)
-    pressure = ctypes.c_double(pressure)
-    temp = ctypes.c_double(temp)
-    tilt = ctypes.c_double(tilt)
-    azm_rotation = ctypes.c_double(azm_rotation)
-
-    sun_alt = (ctypes.c_double * 8760)(*[0]*8760)
-    sun_azi = (ctypes.c_double * 8760)(*[0]*8760)
-    sun_rise = (ctypes.c_double * 8760)(*[0]*8760)
-    sun_set = (ctypes.c_double * 8760)(*[0]*8760)
-
-    getattr(c_lib, "get_sam_sunpos_array")(
-        year, minute, lat, lon, timezone, site_elev, pressure, temp, tilt, azm_rotation,
-        ctypes.byref(sun_alt), ctypes.byref(sun_azi), ctypes.byref(sun_rise), ctypes.byref(sun_set)
-    )
-
-    return list(sun_alt), list(sun_azi), list(sun_rise), list(sun_set)
-
-
 # Windows or linux
 if os.environ.get('OS','').lower().startswith('win'):
     path = "/".join(os.path.abspath(__file__).split("\\")[:-1] + ['shared_library/nrel_spa.dll'])
@@ -60,6 +29,16 @@ else:
 
 c_lib = ctypes.CDLL(path)
 
+__c_double_p = ctypes.POINTER(ctypes.c_double)
+
+# year, minute, lat, lon, timezone, site_elev, pressure, temp, tilt, azm_rotation, alt[8760], azi[8760], rise[8760], set[8760]
+c_lib.get_sam_sunpos_array.argtypes = [ctypes.c_int32] + [ctypes.c_double] * 9 + [__c_double_p] * 4
+c_lib.get_sam_sunpos_array.restype = None
+
+# whole years of the shared library without refraction, by (year, minute, lat, lon, timezone, site_elev, tilt, azm)
+disk_cache = DiskCache(get_cache_path('sun_position'), version=2)
+
+
 def get_sunpos_spa(year, month, day, hour, minute, second,
                    lat, lon, timezone,
                    site_elev, pressure, temp, inclination, azm_rotation):
@@ -113,9 +92,72 @@ def by_hour_of_year(hour_of_year, lon, lat, timezone, site_elev, pressure=1023.2
                           )
 
 
+def get_hourly_sunpos_spa(year, minute,
+                          lat, lon, timezone,
+                          site_elev, pressure, temp, tilt, azm_rotation):
+    """
+    Sun position for all 8760 hours of the year at the given minute of each hour in a single native call.
+    The arrays are written by the shared library in place.
+    :return: numpy arrays altitude, azimuth, sunrise, sunset
+    """
+    sun_alt, sun_azi, sun_rise, sun_set = np.empty((4, 8760))
+
+    c_lib.get_sam_sunpos_array(
+        year, minute, lat, lon, timezone, site_elev, pressure, temp, tilt, azm_rotation,
+        *[array.ctypes.data_as(__c_double_p) for array in (sun_alt, sun_azi, sun_rise, sun_set)]
+    )
 
+    return sun_alt, sun_azi, sun_rise, sun_set
 
 
+def get_hourly_sunpos_spa_cached(year, minute, lat, lon, timezone, site_elev, tilt, azm_rotation):
+    """
+    get_hourly_sunpos_spa without refraction, read from the persistent cache when the same year was computed before.
+    Sunrise and sunset only depend on the date, they are returned once per day of the year.
+    :return: numpy arrays altitude[8760], azimuth[8760], sunrise[365], sunset[365]
+    """
+    key = tuple(float(value) for value in (year, minute, lat, lon, timezone, site_elev, tilt, azm_rotation))
+    entry = disk_cache.get(key)
+    if entry is not None:
+        return entry['altitude'], entry['azimuth'], entry['sunrise'], entry['sunset']
 
-
-
+    # zero pressure disables the refraction correction of the native implementation
+    altitude, azimuth, sunrise, sunset = get_hourly_sunpos_spa(
+        year, minute, lat, lon, timezone, site_elev, 0, 15, tilt, azm_rotation
+    )
+    sunrise, sunset = sunrise[::24].copy(), sunset[::24].copy()
+
+    disk_cache.put(key, {'altitude': altitude, 'azimuth': azimuth, 'sunrise': sunrise, 'sunset': sunset})
+    return altitude, azimuth, sunrise, sunset
+
+
+# get sun_position position for an array of hours of year (float)
+def by_hours_of_year(hours_of_year, lon, lat, timezone, site_elev, pressure=1023.25, temp=15, inclination=0,
+                     azm_rotation=0, year=2008):
+    """
+    Batched version of by_hour_of_year, pressure and temp are scalars or arrays of the same length as hours_of_year.
+    The shared library evaluates a whole year per call, so there is one native call per distinct minute of the hour.
+    These years are kept in the persistent cache, later processes read them from disk instead.
+    Only the altitude depends on pressure and temperature, the refraction for them is applied afterwards in numpy.
+    Sunrise and sunset are returned once per day, day_index maps every hour to its day in these arrays.
+    :return: numpy arrays altitude, azimuth, sunrise, sunset, day_index
+    """
+    hours_of_year = np.atleast_1d(np.asarray(hours_of_year, dtype=np.float64)) % 8760
+    hour_index = hours_of_year.astype(np.int64)
+    minutes = (hours_of_year % 1) * 60
+
+    altitude, azimuth = np.empty((2,) + hours_of_year.shape)
+
+    for minute in np.unique(minutes):
+        selected = minutes == minute
+        year_alt, year_azi, year_rise, year_set = get_hourly_sunpos_spa_cached(
+            year, minute, lat, lon, timezone, site_elev, inclination, azm_rotation
+        )
+        altitude[selected] = year_alt[hour_index[selected]]
+        azimuth[selected] = year_azi[hour_index[selected]]
+
+    altitude += refraction_correction(altitude, pressure, temp)
+
+    days, day_index = np.unique(hour_index // 24, return_inverse=True)
+
+    return altitude, azimuth, year_rise[days], year_set[days], day_index.reshape(hours_of_year.shape)
@@ -0,0 +1,286 @@
+"""
+Vectorized NREL solar position algorithm (SPA) in numpy
+Source: https://www.nrel.gov/docs/fy08osti/34302.pdf
+
+Follows the shared library (SAM's solarpos_spa): the hour of year is mapped to a date of a
+365-day calendar, delta T is taken from the NASA polynomial of the year and delta UT1 is 0.
+"""
+
+import numpy as np
+from .spa_terms import L0, L1, L2, L3, L4, L5, B0, B1, R0, R1, R2, R3, R4, Y_TERMS, PE_TERMS
+
+
+__L_TERMS = [np.array(terms) for terms in (L0, L1, L2, L3, L4, L5)]
+__B_TERMS = [np.array(terms) for terms in (B0, B1)]
+__R_TERMS = [np.array(terms) for terms in (R0, R1, R2, R3, R4)]
+__Y_TERMS = np.array(Y_TERMS, dtype=np.float64)
+__PE_TERMS = np.array(PE_TERMS)
+
+SUN_RADIUS = 0.26667
+ATMOS_REFRACT = 0.5667
+
+# SAM evaluates sunrise and sunset with a fixed delta T of 67 seconds
+RTS_DELTA_T = 67.0
+
+# month (1..12) and day of month of every day of the 365-day year
+DAYS_IN_MONTH = [31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
+__month_of_day = np.repeat(np.arange(1, 13), DAYS_IN_MONTH)
+__day_of_month = np.concatenate([np.arange(1, n + 1) for n in DAYS_IN_MONTH])
+
+
+def limit_degrees(degrees):
+    degrees = degrees / 360.0
+    return 360.0 * (degrees - np.floor(degrees))
+
+
+def limit_degrees180pm(degrees):
+    limited = limit_degrees(degrees)
+    limited = np.where(limited < -180.0, limited + 360.0, limited)
+    return np.where(limited > 180.0, limited - 360.0, limited)
+
+
+def limit_degrees180(degrees):
+    degrees = degrees / 180.0
+    return 180.0 * (degrees - np.floor(degrees))
+
+
+def limit_zero2one(value):
+    return value - np.floor(value)
+
+
+def delta_t(year):
+    # NASA polynomial expressions for delta T in seconds, as used by the shared library
+    year = np.asarray(year)
+    t75 = (year - 1975).astype(np.float64)
+    t00 = (year - 2000).astype(np.float64)
+    return np.select(
+        [(1961 <= year) & (year <= 1986), (1986 < year) & (year <= 2005), (2005 < year) & (year <= 2050)],
+        [
+            t75 * 1.067 + 45.45 - t75 ** 2 / 260.0 - t75 ** 3 / 718.0,
+            t00 * 0.3345 + 63.86 - 0.060374 * t00 ** 2 + 0.0017275 * t00 ** 3 + 0.000651814 * t00 ** 4,
+            t00 * 0.32217 + 62.92 + 0.005589 * t00 ** 2,
+        ],
+        66.7
+    )
+
+
+def julian_day(year, month, day, hour, minute, timezone):
+    day_decimal = day + (hour - timezone + minute / 60.0) / 24.0
+
+    shift = month < 3
+    month = np.where(shift, month + 12, month)
+    year = np.where(shift, year - 1, year)
+
+    jd = np.trunc(365.25 * (year + 4716.0)) + np.trunc(30.6001 * (month + 1)) + day_decimal - 1524.5
+
+    # gregorian calendar
+    a = np.trunc(year / 100)
+    return np.where(jd > 2299160.0, jd + (2 - a + np.trunc(a / 4)), jd)
+
+
+def __earth_values(terms: list, jme):
+    jme = jme[..., np.newaxis]
+    values = 0
+    for i, term in enumerate(terms):
+        values = values + np.sum(term[:, 0] * np.cos(term[:, 1] + term[:, 2] * jme), axis=-1) * jme[..., 0] ** i
+    return values / 1e8
+
+
+def __third_order_polynomial(a, b, c, d, x):
+    return ((a * x + b) * x + c) * x + d
+
+
+def __nutation(jce):
+    x = np.stack([
+        __third_order_polynomial(1.0 / 189474.0, -0.0019142, 445267.11148, 297.85036, jce),    # mean elongation
+        __third_order_polynomial(-1.0 / 300000.0, -0.0001603, 35999.05034, 357.52772, jce),    # anomaly sun
+        __third_order_polynomial(1.0 / 56250.0, 0.0086972, 477198.867398, 134.96298, jce),     # anomaly moon
+        __third_order_polynomial(1.0 / 327270.0, -0.0036825, 483202.017538, 93.27191, jce),    # latitude moon
+        __third_order_polynomial(1.0 / 450000.0, 0.0020708, -1934.136261, 125.04452, jce),     # ascending moon
+    ], axis=-1)
+
+    xy_sum = np.deg2rad(x @ __Y_TERMS.T)
+    jce = jce[..., np.newaxis]
+    del_psi = np.sum((__PE_TERMS[:, 0] + jce * __PE_TERMS[:, 1]) * np.sin(xy_sum), axis=-1) / 36000000.0
+    del_epsilon = np.sum((__PE_TERMS[:, 2] + jce * __PE_TERMS[:, 3]) * np.cos(xy_sum), axis=-1) / 36000000.0
+    return del_psi, del_epsilon
+
+
+def __ecliptic_mean_obliquity(jme):
+    u = jme / 10.0
+    return 84381.448 + u * (-4680.93 + u * (-1.55 + u * (1999.25 + u * (-51.38 + u * (-249.67 + u * (
+        -39.05 + u * (7.12 + u * (27.87 + u * (5.79 + u * 2.45)))))))))
+
+
+def geocentric_sun(jd, delta_t_seconds):
+    """
+    Geocentric right ascension and declination of the sun and the apparent sidereal time.
+    :return: alpha [deg], delta [deg], nu [deg], earth radius vector [AU]
+    """
+    jc = (jd - 2451545.0) / 36525.0
+    jde = jd + delta_t_seconds / 86400.0
+    jce = (jde - 2451545.0) / 36525.0
+    jme = jce / 10.0
+
+    l = limit_degrees(np.rad2deg(__earth_values(__L_TERMS, jme)))
+    b = np.rad2deg(__earth_values(__B_TERMS, jme))
+    r = __earth_values(__R_TERMS, jme)
+
+    theta = l + 180.0
+    theta = np.where(theta >= 360.0, theta - 360.0, theta)
+    beta = -b
+
+    del_psi, del_epsilon = __nutation(jce)
+    epsilon = __ecliptic_mean_obliquity(jme) / 3600.0 + del_epsilon
+
+    lamda = theta + del_psi - 20.4898 / (3600.0 * r)
+
+    nu0 = limit_degrees(280.46061837 + 360.98564736629 * (jd - 2451545.0) + jc * jc * (0.000387933 - jc / 38710000.0))
+    nu = nu0 + del_psi * np.cos(np.deg2rad(epsilon))
+
+    lamda_rad = np.deg2rad(lamda)
+    epsilon_rad = np.deg2rad(epsilon)
+    beta_rad = np.deg2rad(beta)
+
+    alpha = limit_degrees(np.rad2deg(np.arctan2(
+        np.sin(lamda_rad) * np.cos(epsilon_rad) - np.tan(beta_rad) * np.sin(epsilon_rad), np.cos(lamda_rad)
+    )))
+    delta = np.rad2deg(np.arcsin(
+        np.sin(beta_rad) * np.cos(epsilon_rad) + np.cos(beta_rad) * np.sin(epsilon_rad) * np.sin(lamda_rad)
+    ))
+    return alpha, delta, nu, r
+
+
+def topocentric_sun(jd, delta_t_seconds, lon, lat, site_elev):
+    """
+    :return: topocentric elevation angle without refraction [deg] and azimuth (eastward from north) [deg]
+    """
+    alpha, delta, nu, r = geocentric_sun(jd, delta_t_seconds)
+
+    h = limit_degrees(nu + lon - alpha)
+    xi = 8.794 / (3600.0 * r)
+
+    lat_rad = np.deg2rad(lat)
+    xi_rad = np.deg2rad(xi)
+    h_rad = np.deg2rad(h)
+    delta_rad = np.deg2rad(delta)
+
+    u = np.arctan(0.99664719 * np.tan(lat_rad))
+    y = 0.99664719 * np.sin(u) + site_elev * np.sin(lat_rad) / 6378140.0
+    x = np.cos(u) + site_elev * np.cos(lat_rad) / 6378140.0
+
+    delta_alpha_rad = np.arctan2(
+        -x * np.sin(xi_rad) * np.sin(h_rad), np.cos(delta_rad) - x * np.sin(xi_rad) * np.cos(h_rad)
+    )
+    delta_prime = np.rad2deg(np.arctan2(
+        (np.sin(delta_rad) - y * np.sin(xi_rad)) * np.cos(delta_alpha_rad),
+        np.cos(delta_rad) - x * np.sin(xi_rad) * np.cos(h_rad)
+    ))
+    h_prime = h - np.rad2deg(delta_alpha_rad)
+
+    delta_prime_rad = np.deg2rad(delta_prime)
+    h_prime_rad = np.deg2rad(h_prime)
+
+    e0 = np.rad2deg(np.arcsin(
+        np.sin(lat_rad) * np.sin(delta_prime_rad) + np.cos(lat_rad) * np.cos(delta_prime_rad) * np.cos(h_prime_rad)
+    ))
+    azimuth_astro = limit_degrees(np.rad2deg(np.arctan2(
+        np.sin(h_prime_rad), np.cos(h_prime_rad) * np.sin(lat_rad) - np.tan(delta_prime_rad) * np.cos(lat_rad)
+    )))
+    return e0, limit_degrees(azimuth_astro + 180.0)
+
+
+def refraction_correction(e0, pressure, temp):
+    """
+    Atmospheric refraction correction for the topocentric elevation angle e0 without refraction.
+    """
+    e0 = np.asarray(e0, dtype=np.float64)
+    correction = (pressure / 1010.0) * (283.0 / (273.0 + temp)) * 1.02 / (
+            60.0 * np.tan(np.deg2rad(e0 + 10.3 / (e0 + 5.11)))
+    )
+    return np.where(e0 >= -(SUN_RADIUS + ATMOS_REFRACT), correction, 0)
+
+
+def __rts_alpha_delta_prime(ad, n):
+    a = ad[1] - ad[0]
+    b = ad[2] - ad[1]
+    a = np.where(np.abs(a) >= 2.0, limit_zero2one(a), a)
+    b = np.where(np.abs(b) >= 2.0, limit_zero2one(b), b)
+    return ad[1] + n * (a + b + (b - a) * n) / 2.0
+
+
+def sunrise_sunset(year, month, day, lon, lat, timezone):
+    """
+    Local sunrise and sunset hours of the given dates, nan if the sun does not rise or set.
+    """
+    year, month, day = np.broadcast_arrays(np.asarray(year), np.asarray(month), np.asarray(day))
+    h0_prime = -(SUN_RADIUS + ATMOS_REFRACT)
+
+    # sun at 0 UT of the day before, the day itself and the day after
+    jd = julian_day(year, month, day, 0, 0, 0)
+    dt = RTS_DELTA_T
+    _, _, nu, _ = geocentric_sun(jd, dt)
+    alpha, delta, _, _ = geocentric_sun(np.stack([jd - 1, jd, jd + 1]), 0)
+
+    lat_rad = np.deg2rad(lat)
+
+    m_transit = (alpha[1] - lon - nu) / 360.0
+    arg = (np.sin(np.deg2rad(h0_prime)) - np.sin(lat_rad) * np.sin(np.deg2rad(delta[1]))) / (
+            np.cos(lat_rad) * np.cos(np.deg2rad(delta[1]))
+    )
+    h0 = limit_degrees180(np.rad2deg(np.arccos(np.clip(arg, -1, 1)))) / 360.0
+
+    hours = []
+    for m in (limit_zero2one(m_transit - h0), limit_zero2one(m_transit + h0)):
+        n = m + dt / 86400.0
+        delta_prime = __rts_alpha_delta_prime(delta, n)
+        h_prime = limit_degrees180pm(nu + 360.985647 * m + lon - __rts_alpha_delta_prime(alpha, n))
+
+        delta_prime_rad = np.deg2rad(delta_prime)
+        h_prime_rad = np.deg2rad(h_prime)
+        h_rts = np.rad2deg(np.arcsin(
+            np.sin(lat_rad) * np.sin(delta_prime_rad) + np.cos(lat_rad) * np.cos(delta_prime_rad) * np.cos(h_prime_rad)
+        ))
+
+        dayfrac = m + (h_rts - h0_prime) / (360.0 * np.cos(delta_prime_rad) * np.cos(lat_rad) * np.sin(h_prime_rad))
+        hours.append(np.where(np.abs(arg) <= 1, 24.0 * limit_zero2one(dayfrac + timezone / 24.0), np.nan))
+
+    return hours[0], hours[1]
+
+
+def by_hours_of_year(hours_of_year, lon, lat, timezone, site_elev, pressure=1023.25, temp=15, year=2008):
+    """
+    Vectorized counterpart of nrel_spa.by_hours_of_year without the shared library.
+    Hours are wrapped into the 8760 hours of the year like by_hour_of_year, longer time axes are
+    expressed with an array of years of the same length as hours_of_year.
+    Sunrise and sunset are computed once per distinct day, day_index maps every hour to its day in these arrays.
+    :return: numpy arrays altitude, azimuth, sunrise, sunset, day_index
+    """
+    hours_of_year = np.atleast_1d(np.asarray(hours_of_year, dtype=np.float64)) % 8760
+    year = np.broadcast_to(np.asarray(year), hours_of_year.shape)
+
+    day_of_year = (hours_of_year // 24).astype(np.int64)
+    month = __month_of_day[day_of_year]
+    day = __day_of_month[day_of_year]
+    hour = np.floor(hours_of_year % 24)
+    minute = (hours_of_year % 1) * 60
+
+    jd = julian_day(year, month, day, hour, minute, timezone)
+    e0, azimuth = topocentric_sun(jd, delta_t(year), lon, lat, site_elev)
+    altitude = e0 + refraction_correction(e0, pressure, temp)
+
+    # sunrise and sunset only change once per day
+    days, day_index = np.unique(np.stack([year, day_of_year]), axis=1, return_inverse=True)
+    sunrise, sunset = sunrise_sunset(days[0], __month_of_day[days[1]], __day_of_month[days[1]], lon, lat, timezone)
+
+    # like SAM, a sunset before sunrise is taken from the following day
+    late = sunrise > sunset
+    if np.any(late):
+        next_year = days[0][late] + (days[1][late] == 364)
+        next_day = (days[1][late] + 1) % 365
+        _, next_sunset = sunrise_sunset(
+            next_year, __month_of_day[next_day], __day_of_month[next_day], lon, lat, timezone
+        )
+        sunset[late] = next_sunset + 24
+
+    return altitude, azimuth, sunrise, sunset, day_index.reshape(hours_of_year.shape)
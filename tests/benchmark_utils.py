@@ -0,0 +1,15 @@
+import time
+
+
+def benchmark(fun, repeat=1, setup=None):
+    """
+    Shortest duration of repeated calls in [s] and the result of the last call.
+    :param setup: called before every call outside of the timing, its result is passed to fun
+    """
+    durations = []
+    for _ in range(repeat):
+        args = () if setup is None else (setup(),)
+        start_time = time.perf_counter()
+        result = fun(*args)
+        durations.append(time.perf_counter() - start_time)
+    return min(durations), result
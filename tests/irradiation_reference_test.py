@@ -0,0 +1,201 @@
+from math import cos, sin, pi, acos, floor
+import numpy as np
+import weather
+import photovoltaic_module
+from weather import perez
+from weather.perez import perez_diffusion
+from simulation.interface import get_pv_maximum_output
+from tests.benchmark_utils import benchmark
+
+
+# the hour by hour implementation the vectorized irradiation replaces, kept as a reference
+def deg2rad(a):
+    return a * pi / 180
+
+
+def direct_irradiation_tilted_reference(inclination, azimuth, weather_profile, radiation):
+    res = []
+    for i in range(8760):
+        sun_altitude = weather_profile.sun_altitude[i]
+        gamma_s = weather_profile.sun_azimuth[i]
+        sun_rise = weather_profile.sunrise[weather_profile.day_index[i]]
+
+        theta_incidence = cos(deg2rad(sun_altitude)) * sin(deg2rad(inclination)) * cos(deg2rad(azimuth - gamma_s)) \
+                        + sin(deg2rad(sun_altitude)) * cos(deg2rad(inclination))
+        theta_incidence = acos(theta_incidence)
+
+        if sun_altitude < -0.25 or \
+                not (
+                        ((i % 24 + 0.5) - sun_rise) > 0 or floor(sun_rise) != floor((i % 24 + 0.5))
+                ):
+            theta_incidence = 0
+
+        i_direct_tilted = cos(theta_incidence) / sin(deg2rad(sun_altitude)) * radiation[i]
+        res.append(max(i_direct_tilted, 0))
+    return res
+
+
+def diffuse_irradiation_tilted_reference(inclination, radiation, weather_profile):
+    ls = []
+    for i in range(8760):
+        i_diffuse_tilted = max((1 + cos(deg2rad(inclination))) * radiation[i] / 2, 0)
+        if weather_profile.sun_altitude[i] < -0.25:
+            i_diffuse_tilted = 0
+        ls.append(i_diffuse_tilted)
+    return ls
+
+
+def reflected_irradiation_tilted_reference(inclination, direct_radiation, diffuse_radiation, weather_profile, albedo=0.2, threshold=-0.25):
+    ls = []
+    for i in range(8760):
+        radiation = direct_radiation[i] + diffuse_radiation[i]
+        i_reflect_tilted = max((1 - cos(deg2rad(inclination))) * radiation / 2 * albedo, 0)
+        if weather_profile.sun_altitude[i] < threshold:
+            i_reflect_tilted = 0
+        ls.append(i_reflect_tilted)
+    return ls
+
+
+def sky_clearness_to_eta_bin_reference(sky_clearness):
+    for eta_bin, upper_bound in enumerate([1.065, 1.230, 1.500, 1.950, 2.800, 4.500, 6.200]):
+        if sky_clearness <= upper_bound:
+            return eta_bin
+    return 7
+
+
+def perez_diffusion_reference(inclination, azimuth, weather_profile):
+    ls = []
+    for i in range(8760):
+        sun_alt_deg = weather_profile.sun_altitude[i]
+        sun_azi_deg = weather_profile.sun_azimuth[i]
+
+        dni = weather_profile.direct_horizontal_irradiance[i] / sin(deg2rad(sun_alt_deg))
+        dhi = weather_profile.diffuse_horizontal_irradiance[i]
+
+        _di = 0
+        _dc = 0
+        _dh = 0
+
+        if sun_alt_deg > -0.25:
+            _di = dhi * (1 + cos(deg2rad(inclination))) / 2
+
+        if sun_alt_deg > 2.5:
+            theta_incidence = cos(deg2rad(sun_alt_deg)) * sin(deg2rad(inclination)) * cos(
+                deg2rad(azimuth - sun_azi_deg)) \
+                              + sin(deg2rad(sun_alt_deg)) * cos(deg2rad(inclination))
+            theta_incidence = acos(theta_incidence)
+
+            _k_sun_azimuth_3 = perez.k * (90 - sun_alt_deg)**3
+            _sky_clearness = ((dhi + dni) / dhi + _k_sun_azimuth_3) / (1 + _k_sun_azimuth_3)
+            _airmass = (cos(deg2rad(90 - sun_alt_deg)) + 0.15 * (sun_alt_deg + 3.9)**(-1.253))**-1
+            _delta = dhi * _airmass / 1367
+
+            eta_bin = sky_clearness_to_eta_bin_reference(_sky_clearness)
+            zenith = pi/2 - deg2rad(sun_alt_deg)
+            _f1 = max(0, perez.f11[eta_bin] + perez.f12[eta_bin] * _delta + zenith * perez.f13[eta_bin])
+            _f2 = perez.f21[eta_bin] + perez.f22[eta_bin] * _delta + zenith * perez.f23[eta_bin]
+
+            _a = max(0, cos(theta_incidence))
+            _b = max(cos(deg2rad(85)), cos(deg2rad(90 - sun_alt_deg)))
+
+            _di = dhi * (1 - _f1) * (1 + cos(deg2rad(inclination))) / 2
+            _dc = dhi * _f1 * _a / _b
+            _dh = dhi * _f2 * sin(deg2rad(inclination))
+
+        ls.append(_di + _dc + _dh)
+    return ls
+
+
+def get_incident_radiation_reference(weather_profile, inclination, azimuth, diffuse_model="isotropic", albedo=0.2):
+    adjusted_beam = []
+    for h in range(8760):
+        _si = sin(weather_profile.sun_altitude[h] * pi / 180)
+        dni = min(1100, max(0, weather_profile.direct_horizontal_irradiance[h] / _si))
+        adjusted_beam.append(dni * _si)
+    diffuse_radiation = weather_profile.diffuse_horizontal_irradiance
+
+    direct = direct_irradiation_tilted_reference(inclination, azimuth, weather_profile, adjusted_beam)
+    if diffuse_model == "isotropic":
+        diffuse = diffuse_irradiation_tilted_reference(inclination, diffuse_radiation, weather_profile)
+        reflect = reflected_irradiation_tilted_reference(inclination, adjusted_beam, diffuse_radiation, weather_profile,
+                                                         albedo=albedo)
+    else:
+        diffuse = perez_diffusion_reference(inclination, azimuth, weather_profile)
+        reflect = reflected_irradiation_tilted_reference(inclination, adjusted_beam, diffuse_radiation, weather_profile,
+                                                         albedo=albedo, threshold=2.5)
+
+    return [direct[i] + diffuse[i] + reflect[i] for i in range(8760)]
+
+
+def get_pv_maximum_output_reference(irradiance, weather_profile, panel):
+    return [[panel.get_mpp(
+        t=weather_profile.temperature[day * 24 + hour],
+        g=irradiance[day * 24 + hour],
+        vw=weather_profile.wind_speed[day * 24 + hour]
+    ) for hour in range(24)] for day in range(365)]
+
+
+def assert_close(values, reference, message):
+    assert np.allclose(values, reference, rtol=1e-9, atol=1e-9), \
+        f"{message}: max difference {np.max(np.abs(np.asarray(values) - reference)):.3g} W/m²"
+
+
+# compares the vectorized irradiation and PV output with the hour by hour reference
+if __name__ == "__main__":
+    weather_profile = weather.by_zip_code('52074')
+    inclinations = np.array([0, 21, 35, 60, 90])
+    azimuths = np.array([90, 205, 180, 270, 0])
+    panel = photovoltaic_module.SimpleEfficiencyModel(dict(mu_mpp=-0.351, mpp=290, width=1, height=1.63))
+
+    # one row per surface when inclination and azimuth are given as (n, 1) arrays
+    perez_references = np.array([
+        perez_diffusion_reference(inclination, azimuth, weather_profile)
+        for inclination, azimuth in zip(inclinations, azimuths)
+    ])
+    for reference, inclination, azimuth in zip(perez_references, inclinations, azimuths):
+        assert_close(perez_diffusion(inclination, azimuth, weather_profile), reference,
+                     f"perez_diffusion differs for {inclination}° {azimuth}°")
+    assert_close(perez_diffusion(inclinations.reshape(-1, 1), azimuths.reshape(-1, 1), weather_profile),
+                 perez_references, "perez_diffusion differs for (n, 1) surfaces")
+
+    for diffuse_model in ["isotropic", "perez"]:
+        references = np.array([
+            get_incident_radiation_reference(weather_profile, inclination, azimuth, diffuse_model)
+            for inclination, azimuth in zip(inclinations, azimuths)
+        ])
+
+        for reference, inclination, azimuth in zip(references, inclinations, azimuths):
+            surface = f"{diffuse_model} {inclination}° {azimuth}°"
+            assert_close(weather.get_incident_radiation(weather_profile, inclination, azimuth, 0, diffuse_model),
+                         reference, f"get_incident_radiation differs for {surface}")
+            assert_close(weather.get_incident_radiation(weather_profile, inclination, azimuth, 0, diffuse_model,
+                                                        daylight_only=True),
+                         reference, f"get_incident_radiation with daylight_only differs for {surface}")
+
+        by_surfaces = weather.get_incident_radiation_by_surfaces(weather_profile, inclinations, azimuths, diffuse_model)
+        daylight = weather.get_incident_radiation_by_surfaces(
+            weather_profile, inclinations, azimuths, diffuse_model, daylight_only=True
+        )
+        assert_close(by_surfaces, references, f"get_incident_radiation_by_surfaces differs for {diffuse_model}")
+        assert np.array_equal(daylight, by_surfaces), f"daylight_only changes the irradiance for {diffuse_model}"
+
+        output = get_pv_maximum_output(by_surfaces, weather_profile, panel, 0)
+        output_daylight = get_pv_maximum_output(by_surfaces, weather_profile, panel, 0, daylight_only=True)
+        reference_output = np.array([
+            get_pv_maximum_output_reference(reference.tolist(), weather_profile, panel) for reference in references
+        ])
+        assert output.shape == (len(inclinations), 365, 24)
+        assert np.allclose(output, reference_output, rtol=1e-9, atol=1e-9), f"PV output differs for {diffuse_model}"
+        assert np.array_equal(output_daylight, output), f"daylight_only changes the PV output for {diffuse_model}"
+
+        t_reference, _ = benchmark(
+            lambda: get_incident_radiation_reference(weather_profile, inclinations[1], azimuths[1], diffuse_model), 3
+        )
+        t_vectorized, _ = benchmark(
+            lambda: weather.get_incident_radiation(weather_profile, inclinations[1], azimuths[1], 0, diffuse_model), 20
+        )
+        t_surfaces, _ = benchmark(
+            lambda: weather.get_incident_radiation_by_surfaces(weather_profile, inclinations, azimuths, diffuse_model), 20
+        )
+        print(f"{diffuse_model}\treference {t_reference * 1000:.1f} ms\tvectorized {t_vectorized * 1000:.2f} ms"
+              f"\t{len(inclinations)} surfaces {t_surfaces * 1000:.2f} ms")
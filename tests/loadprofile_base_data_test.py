@@ -0,0 +1,14 @@
+import os
+import numpy as np
+from loadprofile import profile
+
+
+# the compiled .npy base profiles have to match their .txt sources
+if __name__ == "__main__":
+    data_path = os.path.join(os.path.dirname(os.path.abspath(profile.__file__)), 'default_data')
+
+    for name in profile.BASE_PROFILES:
+        compiled = np.load(os.path.join(data_path, name + '.npy'))
+        source = profile.read_base_profile_txt(name)
+        assert np.array_equal(compiled, source), f"{name}.npy is outdated, rebuild it with `python -m loadprofile`"
+        print(f"{name}\t{compiled.shape}\tidentical to {name}.txt")
@@ -0,0 +1,49 @@
+import numpy as np
+import loadprofile
+from tests.benchmark_utils import benchmark
+from tests.loadprofile_year_test import get_configurations, reference_by_year
+
+
+COLUMNS = ['profile', 'number_of_residents', 'building_type', 'is_warm_water_electric', 'rating', 'area', 'shift']
+
+
+# one row per configuration, missing parameters take the defaults of by_day_of_year
+def get_table(configurations: list) -> dict:
+    defaults = dict(
+        profile=loadprofile.ProfileType.Residential,
+        number_of_residents=1,
+        building_type=loadprofile.ResidentialBuildingType.House,
+        is_warm_water_electric=False,
+        rating=loadprofile.ResidentialRating.D,
+        area=None,
+        shift=0,
+    )
+    table = {column: [configuration.get(column, defaults[column]) for configuration in configurations] for column in COLUMNS}
+    # class names and consumptions, missing areas
+    table['rating'] = np.array(table['rating'], dtype=object)
+    table['area'] = np.array(table['area'], dtype=object)
+    return table
+
+
+# compares the batch generator with the day by day reference of every row
+if __name__ == "__main__":
+    configurations = get_configurations()
+    table = get_table(configurations)
+    reference = np.array([reference_by_year(configuration) for configuration in configurations])
+
+    profiles = loadprofile.by_table(table, dtype=np.float64)
+    assert np.array_equal(profiles, reference), "by_table differs from the reference at float64"
+
+    profiles = loadprofile.by_table(table)
+    assert profiles.dtype == np.float32
+    assert np.allclose(profiles, reference, rtol=1e-6, atol=0), "by_table differs from the reference at float32"
+
+    empty = loadprofile.by_table({column: [] for column in COLUMNS})
+    assert empty.shape == (0, 365, 24) and empty.dtype == np.float32, "empty table"
+    assert loadprofile.by_table({'rating': []}, dtype=np.float64).shape == (0, 365, 24), "empty table"
+
+    large_table = {column: np.repeat(values, 100) for column, values in table.items()}
+    t_batch, _ = benchmark(lambda: loadprofile.by_table(large_table), 3)
+
+    print(f"identical for {len(configurations)} configurations")
+    print(f"timing\t{len(configurations) * 100} buildings {t_batch * 1000:.1f} ms")
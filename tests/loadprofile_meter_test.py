@@ -0,0 +1,114 @@
+import os
+import calendar
+import datetime
+import tempfile
+import numpy as np
+from loadprofile import meter
+
+
+# 15 minute energy readings in [kWh] of 2023 and the leap year 2024, some of them missing
+def generate_readings(seed=0):
+    rng = np.random.default_rng(seed)
+    start = np.datetime64('2023-01-01T00:00')
+    count = (365 + 366) * 96
+    timestamps = start + np.arange(count) * np.timedelta64(15, 'm')
+
+    power = rng.uniform(100, 2000, count)
+    energy = np.round(power * 0.25 / 1000, 6)
+    energy[rng.choice(count, size=500, replace=False)] = np.nan
+    return timestamps, energy
+
+
+# hour by hour mean power of the available readings of both years on the 365-day axis
+def reference_profile(timestamps, energy):
+    powers = [[] for _ in range(8760)]
+    for timestamp, value in zip(timestamps.tolist(), energy.tolist()):
+        day = timestamp.timetuple().tm_yday - 1
+        leap = timestamp.year % 4 == 0
+        if leap and day == 59:
+            continue
+        if leap and day > 59:
+            day -= 1
+        if value == value:
+            powers[day * 24 + timestamp.hour].append(value * 1000 * 4)
+    return np.array([sum(hour) / len(hour) for hour in powers]).reshape(365, 24)
+
+
+# export with the timestamps at the end of the intervals as 'DD.MM.YYYY HH:MM', decimal commas
+# and empty fields for missing readings
+def write_csv(path, timestamps, energy):
+    ends = np.datetime_as_string(timestamps + np.timedelta64(15, 'm'), unit='m')
+    with open(path, 'w') as file:
+        file.write('Zeitstempel;Verbrauch [kWh]\n')
+        for end, value in zip(ends, energy.tolist()):
+            reading = '' if value != value else repr(value).replace('.', ',')
+            file.write(f"{end[8:10]}.{end[5:7]}.{end[0:4]} {end[11:16]};{reading}\n")
+
+
+# the timestamps of the UTC+1 axis on the German wall clock, summer time runs from the last Sunday
+# of March 02:00 to the last Sunday of October 02:00 in UTC+1
+def to_wall_clock(timestamps):
+    def last_sunday(year, month):
+        return max(week[6] for week in calendar.monthcalendar(year, month))
+
+    wall = []
+    for timestamp in timestamps.tolist():
+        begin = timestamp.replace(month=3, day=last_sunday(timestamp.year, 3), hour=2, minute=0)
+        end = timestamp.replace(month=10, day=last_sunday(timestamp.year, 10), hour=2, minute=0)
+        wall.append(timestamp + datetime.timedelta(hours=1) if begin <= timestamp < end else timestamp)
+    return np.array(wall, dtype='datetime64[m]')
+
+
+def write_iso_csv(path, timestamps, energy):
+    with open(path, 'w') as file:
+        file.write('timestamp,energy\n')
+        for timestamp, value in zip(np.datetime_as_string(timestamps, unit='m'), energy.tolist()):
+            file.write(f"{timestamp},{value!r}\n")
+
+
+# compares the streamed meter profiles with the hour by hour reference
+if __name__ == "__main__":
+    timestamps, energy = generate_readings()
+    reference = reference_profile(timestamps, energy)
+    wall_clock = to_wall_clock(timestamps)
+
+    # readings from the 1st of July on, given by a start in summer time
+    july = np.flatnonzero(timestamps == np.datetime64('2023-07-01T00:00'))[0] - 4
+    reference_july = reference_profile(timestamps[july:], energy[july:])
+
+    # blocks that do not align with hours or days
+    meter.set_chunk_size(1000)
+
+    with tempfile.TemporaryDirectory() as folder:
+        csv_path = os.path.join(folder, 'meter.csv')
+        npy_path = os.path.join(folder, 'meter.npy')
+        raw_path = os.path.join(folder, 'meter.bin')
+
+        wall_path = os.path.join(folder, 'wall_clock.csv')
+        utc_path = os.path.join(folder, 'utc.csv')
+
+        write_csv(csv_path, timestamps, energy)
+        write_iso_csv(wall_path, wall_clock, energy)
+        write_iso_csv(utc_path, timestamps - np.timedelta64(60, 'm'), energy)
+        np.save(npy_path, energy)
+        energy.astype('<f4').tofile(raw_path)
+
+        from_csv = meter.from_csv(csv_path, unit='kWh', decimal=',', dayfirst=True, label='end')
+        from_npy = meter.from_binary(npy_path, start='2023-01-01 00:00', unit='kWh')
+        from_raw = meter.from_binary(raw_path, start='2023-01-01 00:15', unit='kWh', label='end')
+
+        from_wall = meter.from_csv(wall_path, delimiter=',', daylight_saving=True)
+        from_utc = meter.from_csv(utc_path, delimiter=',', utc_offset=0)
+        np.save(npy_path, energy[july:])
+        from_july = meter.from_binary(npy_path, start=str(wall_clock[july]), daylight_saving=True)
+
+    assert from_csv.shape == (365, 24)
+    assert np.allclose(from_csv, reference, rtol=1e-12, atol=0), "CSV profile differs from the reference"
+    assert np.allclose(from_npy, reference, rtol=1e-12, atol=0), ".npy profile differs from the reference"
+    assert np.allclose(from_raw, reference, rtol=1e-6, atol=0), "float32 profile differs from the reference"
+    assert np.allclose(from_wall, reference, rtol=1e-12, atol=0), "summer time profile differs from the reference"
+    assert np.allclose(from_utc, reference, rtol=1e-12, atol=0), "UTC profile differs from the reference"
+    assert np.allclose(from_july, reference_july, rtol=1e-12, atol=0), "summer time start differs from the reference"
+
+    print(f"annual load\treference {reference.sum() / 1000:.1f} kWh\tCSV {from_csv.sum() / 1000:.1f} kWh"
+          f"\tnpy {from_npy.sum() / 1000:.1f} kWh\tfloat32 {from_raw.sum() / 1000:.1f} kWh")
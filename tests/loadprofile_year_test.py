@@ -0,0 +1,93 @@
+import itertools
+import numpy as np
+import loadprofile
+from loadprofile import profile, ProfileType, ResidentialBuildingType
+
+
+# the day by day implementation by_year and by_day_of_year replace, kept as a reference
+def reference_by_day_of_year(
+        day_num,
+        profile_type=ProfileType.Residential,
+        number_of_residents=1,
+        building_type=ResidentialBuildingType.House,
+        is_warm_water_electric=False,
+        rating='d',
+        area=None,
+        shift=0
+):
+    def scale(ls, scalar):
+        return [ls[i] * scalar for i in range(len(ls))]
+
+    def shift_by_hour(ls, hour):
+        if hour == 0:
+            return ls
+        shifted = np.roll(np.array(ls).flatten(), hour)
+        dim = len(ls[0])
+        return [shifted[i: i+dim].tolist() for i in range(0, len(shifted), dim)]
+
+    number_of_residents = min(number_of_residents, 6)
+
+    if profile_type == ProfileType.Residential and type(rating) == str:
+        warm_water = 'mitStrom' if is_warm_water_electric else 'ohneStrom'
+        factor = profile.scale_stromspiegel_h0[building_type][warm_water][number_of_residents - 1][profile.get_usage(rating)]
+        return scale(shift_by_hour(profile.h0, shift)[day_num], factor / 1000)
+
+    elif profile_type == ProfileType.Residential and type(rating) in [float, int]:
+        return scale(shift_by_hour(profile.h0, shift)[day_num], rating / 1000)
+
+    day_of_week = min(day_num % 7, 2)
+    if day_num > 305 or day_num < 79:
+        res = profile.g0[day_of_week]
+    elif 135 < day_num < 257:
+        res = profile.g0[3 + day_of_week]
+    else:
+        res = profile.g0[6 + day_of_week]
+
+    if type(rating) in [float, int]:
+        return scale(res, rating / 1018.7044245)
+    return scale(res, (profile.stromspiegel_g0_per_m2[rating] * area) / 1018.7044245)
+
+
+def get_configurations() -> list:
+    """
+    Households by class and by consumption with positive, negative and wrapping shifts, businesses by area and consumption.
+    """
+    configurations = []
+    for residents, building_type, warm_water, rating in itertools.product(
+            range(1, 6), [ResidentialBuildingType.House, ResidentialBuildingType.Apartment], [False, True], 'abcdefg'
+    ):
+        configurations.append(dict(
+            number_of_residents=residents, building_type=building_type, is_warm_water_electric=warm_water, rating=rating
+        ))
+    for shift in [1, 3, -5, 30, -49, 8760 + 7]:
+        configurations.append(dict(rating='c', number_of_residents=2, shift=shift))
+        configurations.append(dict(rating=3500.0, shift=shift))
+    for rating in [1500, 4200.5]:
+        configurations.append(dict(rating=rating))
+    for rating in profile.stromspiegel_g0_per_m2:
+        configurations.append(dict(profile=ProfileType.Commercial, rating=rating, area=250))
+    for rating in [12000, 5000.0]:
+        configurations.append(dict(profile=ProfileType.Commercial, rating=rating, shift=4))
+    return configurations
+
+
+def reference_by_year(configuration: dict) -> np.ndarray:
+    kwargs = dict(configuration)
+    if 'profile' in kwargs:
+        kwargs['profile_type'] = kwargs.pop('profile')
+    return np.array([reference_by_day_of_year(day, **kwargs) for day in range(365)])
+
+
+# compares by_year and by_day_of_year with the day by day reference
+if __name__ == "__main__":
+    configurations = get_configurations()
+
+    for configuration in configurations:
+        reference = reference_by_year(configuration)
+        annual = loadprofile.by_year(**configuration)
+        daily = [loadprofile.by_day_of_year(day, **configuration) for day in range(365)]
+
+        assert np.array_equal(annual, reference), f"by_year differs for {configuration}"
+        assert daily == reference.tolist(), f"by_day_of_year differs for {configuration}"
+
+    print(f"identical for {len(configurations)} configurations")
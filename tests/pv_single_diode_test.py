@@ -0,0 +1,76 @@
+import warnings
+import numpy as np
+import photovoltaic_module
+import weather
+from tests.benchmark_utils import benchmark
+
+
+# largest power on a fine grid of diode voltages between short circuit and open circuit
+def sweep_mpp(panel, cell_temperature, g, points=20001):
+    i_l, i_o, r_s, r_sh, a = panel.get_parameters(cell_temperature, g)
+    v_d = np.linspace(0, 1, points) * a * np.log1p(i_l / i_o)
+    i = i_l - i_o * np.expm1(v_d / a) - v_d / r_sh
+    return ((v_d - i * r_s) * i).max()
+
+
+# compares the single diode model with the simple efficiency model on one surface over a year
+if __name__ == "__main__":
+    weather_profile = weather.by_zip_code('52074')
+
+    incident_radiation = weather.get_incident_radiation(
+        weather_profile=weather_profile,
+        inclination=21,
+        azimuth=205,
+        roof_index=0,
+        albedo=0.2
+    )
+
+    # parameters of a 60 cell module around 290 W
+    diode_panel = photovoltaic_module.SingleDiodeModel(dict(
+        I_L_ref=9.8, I_o_ref=2e-10, R_s=0.35, R_sh_ref=350, a_ref=1.6, alpha_sc=0.0045, width=1, height=1.63
+    ))
+    simple_panel = photovoltaic_module.SimpleEfficiencyModel(dict(
+        mu_mpp=-0.351, mpp=diode_panel.mpp_ref, width=1, height=1.63
+    ))
+
+    def hourly(panel):
+        return panel.get_mpp(t=weather_profile.temperature, g=incident_radiation, vw=weather_profile.wind_speed)
+
+    def scalar_hourly(panel):
+        return [panel.get_mpp(
+            t=weather_profile.temperature[i],
+            g=incident_radiation[i],
+            vw=weather_profile.wind_speed[i]
+        ) for i in range(8760)]
+
+    t_simple, p_simple = benchmark(lambda: hourly(simple_panel), 10)
+    t_diode, p_diode = benchmark(lambda: hourly(diode_panel), 10)
+    t_scalar, p_scalar = benchmark(lambda: scalar_hourly(diode_panel), 1)
+
+    assert np.allclose(p_diode, p_scalar, rtol=1e-9, atol=1e-9), "vectorized and scalar solutions differ"
+
+    # no voltage of the sweep beats Newton's maximum power point
+    lit_hours = np.flatnonzero(incident_radiation > 0)
+    sample = np.random.default_rng(0).choice(lit_hours, size=200, replace=False)
+    cell_temperature = diode_panel.get_cell_t(
+        273.15 + weather_profile.temperature[sample], incident_radiation[sample], weather_profile.wind_speed[sample]
+    )
+    for hour, t_cell in zip(sample, cell_temperature):
+        v, i = diode_panel.get_mpp_iv(t_cell, incident_radiation[hour])
+        p_sweep = sweep_mpp(diode_panel, t_cell, incident_radiation[hour])
+        assert p_sweep - v * i < 1e-9, f"hour {hour}: the sweep finds {p_sweep - v * i:.3g} W more"
+        assert v * i - p_sweep < 1e-6 * v * i, f"hour {hour}: {v * i - p_sweep:.3g} W above the sweep"
+
+    # an unconverged solution is reported
+    diode_panel.max_iterations = 1
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        diode_panel.get_mpp_iv(298.15, 800)
+    assert any(issubclass(warning.category, RuntimeWarning) for warning in caught), "no warning after 1 iteration"
+    del diode_panel.max_iterations
+
+    print(f"STC power\t{diode_panel.mpp_ref:.1f} W")
+    print(f"annual DC\tsimple {p_simple.sum() / 1000:.1f} kWh\tsingle diode {p_diode.sum() / 1000:.1f} kWh"
+          f"\tdifference {(p_diode.sum() / p_simple.sum() - 1) * 100:+.2f} %")
+    print(f"timing\tsimple {t_simple * 1000:.2f} ms\tsingle diode {t_diode * 1000:.2f} ms"
+          f"\tsingle diode per hour {t_scalar * 1000:.0f} ms")
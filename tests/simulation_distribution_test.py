@@ -0,0 +1,56 @@
+import numpy as np
+from simulation._simulation import get_energy_distributions
+from tests.benchmark_utils import benchmark
+
+
+# the loop implementation the vectorized one replaces
+def reference_energy_distributions(energy_balance, num_classes=100):
+    surplus_daily_energy = [sum([energy for energy in day if energy >= 0]) for day in energy_balance]
+    deficit_daily_energy = [sum([energy for energy in day if energy < 0]) for day in energy_balance]
+
+    max_surplus = max(surplus_daily_energy)
+    max_deficit = -min(deficit_daily_energy)
+
+    surplus_distribution = [0 for _ in range(num_classes)]
+    surplus_classes = [max_surplus * (i + 0.3) / num_classes for i in range(num_classes)]
+
+    deficit_distribution = [0 for _ in range(num_classes)]
+    deficit_classes = [max_deficit * (i + 0.3) / num_classes for i in range(num_classes)]
+
+    for class_num in range(num_classes):
+        floor_energy_surplus = max_surplus * class_num / num_classes
+        ceil_energy_surplus = max_surplus * (class_num+1) / num_classes
+
+        floor_energy_deficit = max_deficit * class_num / num_classes
+        ceil_energy_deficit = max_deficit * (class_num+1) / num_classes
+
+        for day in range(365):
+            if floor_energy_surplus <= surplus_daily_energy[day] < ceil_energy_surplus+1:
+                surplus_distribution[class_num] += 1/365
+
+            if floor_energy_deficit <= -deficit_daily_energy[day] < ceil_energy_deficit+1:
+                deficit_distribution[class_num] += 1/365
+
+    return surplus_distribution, surplus_classes, deficit_distribution, deficit_classes
+
+
+# compares the vectorized distributions with the loops on random energy balances
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+
+    # PV output around noon minus a base load, in [Wh]
+    hours = np.arange(24)
+    pv = np.clip(np.sin((hours - 6) / 12 * np.pi), 0, None) * rng.uniform(0, 4000, size=(365, 1))
+    balances = [pv - rng.uniform(200, 800, size=(365, 24)) for _ in range(20)]
+
+    for balance in balances:
+        result = get_energy_distributions(balance)
+        expected = reference_energy_distributions(balance)
+        for values, expected_values in zip(result, expected):
+            assert np.array_equal(values, expected_values), "vectorized and loop distributions differ"
+
+    t_loop, _ = benchmark(lambda: reference_energy_distributions(balances[0]), 5)
+    t_numpy, _ = benchmark(lambda: get_energy_distributions(balances[0]), 50)
+
+    print(f"identical on {len(balances)} energy balances")
+    print(f"timing\tloops {t_loop * 1000:.2f} ms\tnumpy {t_numpy * 1000:.3f} ms\tspeedup {t_loop / t_numpy:.0f}x")
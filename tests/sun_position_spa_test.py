@@ -0,0 +1,36 @@
+import numpy as np
+from sun_position import nrel_spa, spa
+from tests.benchmark_utils import benchmark
+
+
+# compares the numpy SPA with the shared library over whole years at a few locations
+if __name__ == "__main__":
+    # time the native calls instead of the persistent cache
+    nrel_spa.disk_cache.path = None
+
+    hours = np.arange(8760) + 0.5
+    temperature = 15 + 10 * np.sin(hours / 500)
+    pressure = 1000 + 20 * np.cos(hours / 300)
+
+    locations = [
+        # lon, lat, year, site elevation
+        (6.0854, 50.7755, 2008, 0),
+        (13.4050, 52.5200, 1995, 50),
+        (-70.000, -33.000, 2040, 500),
+        (120.00, -10.000, 2060, 0),
+    ]
+
+    for lon, lat, year, site_elev in locations:
+        kwargs = dict(timezone=1, site_elev=site_elev, pressure=pressure, temp=temperature, year=year)
+        t_native, native = benchmark(lambda: nrel_spa.by_hours_of_year(hours, lon, lat, **kwargs))
+        t_numpy, vectorized = benchmark(lambda: spa.by_hours_of_year(hours, lon, lat, **kwargs))
+
+        assert np.array_equal(native[4], vectorized[4]), "day index differs"
+        errors = [np.max(np.abs(a - b)) for a, b in zip(native[:4], vectorized[:4])]
+        assert errors[0] < 1e-8 and errors[1] < 1e-8, "altitude or azimuth differs"
+        assert errors[2] < 1e-3 and errors[3] < 1e-3, "sunrise or sunset differs"
+
+        print(f"({lon}, {lat}) {year}"
+              f"\taltitude {errors[0]:.1e}°\tazimuth {errors[1]:.1e}°"
+              f"\tsunrise {errors[2] * 3600:.2f} s\tsunset {errors[3] * 3600:.2f} s"
+              f"\tnative {t_native * 1000:.0f} ms\tnumpy {t_numpy * 1000:.0f} ms")
@@ -31,4 +31,4 @@ if __name__ == "__main__":
         simulation=sim,
     )
 
-    print_errors(data['results'], hyp=vars(sim.result))
+    print_errors(data['results'], hyp=sim.result.as_lists())
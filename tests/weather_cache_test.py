@@ -0,0 +1,87 @@
+import os
+import sys
+import zipfile
+import tempfile
+import numpy as np
+import weather
+from weather import archive_index
+
+
+# writes the member of a zip code into a new archive with the temperature raised by 10 K
+def write_modified_archive(dataset_path, zip_code, archive_path):
+    entry = archive_index.get_index(dataset_path)[zip_code]
+    lines = archive_index.read_entry(dataset_path, entry['name']).read().splitlines()
+
+    for i in range(weather.weather_profile.HEADER_LINES, weather.weather_profile.HEADER_LINES + 8760):
+        fields = lines[i].split()
+        fields[5] = f"{float(fields[5]) + 10:.1f}"
+        lines[i] = ' '.join(fields)
+
+    with zipfile.ZipFile(archive_path, 'w', zipfile.ZIP_DEFLATED) as zip_ref:
+        zip_ref.writestr(entry['name'], '\n'.join(lines) + '\n')
+
+
+# evicts the least recently used profiles once the cache holds more than two of them
+def check_eviction(dataset_path):
+    cells = sorted({entry['cell'] for entry in archive_index.get_index(dataset_path).values()})[:3]
+    assert len(cells) == 3, "the dataset has less than three TRY cells"
+
+    weather.cache_clear()
+    first = weather.by_zip_code(cells[0])
+    # room for two profiles but not for three
+    max_bytes = int(first.nbytes * 2.5)
+    weather.set_cache_size(max_bytes)
+
+    second = weather.by_zip_code(cells[1])
+    assert weather.by_zip_code(cells[0]) is first
+    # the second profile is now the least recently used one
+    third = weather.by_zip_code(cells[2])
+
+    info = weather.cache_info()
+    assert (info.hits, info.misses, info.evictions, info.entries) == (1, 3, 1, 2), info
+    assert (info.current_bytes, info.max_bytes) == (first.nbytes + third.nbytes, max_bytes), info
+
+    assert weather.by_zip_code(cells[0]) is first, "the recently used profile was evicted"
+    assert weather.by_zip_code(cells[1]) is not second, "the least recently used profile was kept"
+    assert weather.by_zip_code(cells[2]) is not third, "the least recently used profile was kept"
+
+    # shrinking evicts right away, down to the most recently used profile
+    weather.set_cache_size(third.nbytes)
+    info = weather.cache_info()
+    assert (info.hits, info.misses, info.evictions, info.entries) == (2, 5, 4, 1), info
+    assert info.current_bytes == third.nbytes, info
+    assert weather.by_zip_code(cells[2]).nbytes == third.nbytes
+
+    weather.set_cache_size(64 * 2**20)
+    weather.cache_clear()
+    print(f"eviction\t{first.nbytes / 2**20:.2f} MiB per profile\t{info}")
+
+
+# the process-wide cache has to tell the profiles of two datasets apart
+if __name__ == '__main__':
+    # the weather core must not pull in the geocoding client of utils
+    assert 'requests' not in sys.modules, "import weather loaded requests"
+
+    root = os.path.split(os.path.split(os.path.abspath(__file__))[0])[0]
+    previous_path = weather.get_dataset_path()
+    dataset_path = os.path.join(root, previous_path)
+
+    check_eviction(dataset_path)
+
+    original = weather.by_zip_code('52074')
+
+    with tempfile.TemporaryDirectory() as folder:
+        archive_path = os.path.join(folder, 'dwd_zips.zip')
+        write_modified_archive(dataset_path, '52074', archive_path)
+
+        weather.set_dataset_path(archive_path)
+        try:
+            modified = weather.by_zip_code('52074')
+        finally:
+            weather.set_dataset_path(previous_path)
+
+    assert np.allclose(modified.temperature, original.temperature + 10), "stale profile of the previous dataset"
+    assert modified.profile_key != original.profile_key, "derived caches would share the profile"
+    assert weather.by_zip_code('52074') is original, "profile of the original dataset was not cached"
+
+    print(f"temperature\toriginal {original.temperature[0]:.1f}\tmodified {modified.temperature[0]:.1f}")
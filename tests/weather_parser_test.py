@@ -0,0 +1,51 @@
+import weather
+from weather import archive_index
+from weather.weather_profile import parse_entry
+from tests.benchmark_utils import benchmark
+
+
+# the list based parser used before the vectorized one, kept as a reference
+def parse_entry_reference(file):
+    lines = [line.strip().replace('  ', ' ').replace('  ', ' ') for line in file.readlines()]
+
+    rows = [lines[34 + i].split(' ') for i in range(8760)]
+    res = list(map(list, zip(*rows)))
+    return {
+        'RW': [int(i) for i in res[0]],
+        'HW': [int(i) for i in res[1]],
+        'MM': [int(i) for i in res[2]],
+        'DD': [int(i) for i in res[3]],
+        'HH': [int(i) for i in res[4]],
+        't':  [float(i) for i in res[5]],
+        'p':  [int(i) for i in res[6]],
+        'WR': [int(i) for i in res[7]],
+        'WG': [float(i) for i in res[8]],
+        'N':  [int(i) for i in res[9]],
+        'x':  [float(i) for i in res[10]],
+        'RF': [int(i) for i in res[11]],
+        'B':  [float(i) for i in res[12]],
+        'D':  [float(i) for i in res[13]],
+        'A':  [float(i) for i in res[14]],
+        'E':  [float(i) for i in res[15]],
+        'IL': [int(i) for i in res[16]],
+    }
+
+
+# compares the vectorized TRY parser with the list based reference
+if __name__ == "__main__":
+    path = weather.get_dataset_path()
+    repeat = 10
+
+    for zip_code, entry in archive_index.get_index(path).items():
+        def read_entry():
+            return archive_index.read_entry(path, entry['name'])
+
+        t_reference, reference = benchmark(parse_entry_reference, repeat, setup=read_entry)
+        t_vectorized, vectorized = benchmark(parse_entry, repeat, setup=read_entry)
+
+        for column in reference:
+            assert vectorized[column].tolist() == reference[column], f"{zip_code}: column {column} differs"
+
+        print(f"{zip_code}\treference {t_reference * 1000:.1f} ms"
+              f"\tvectorized {t_vectorized * 1000:.1f} ms"
+              f"\tspeedup {t_reference / t_vectorized:.1f}x")
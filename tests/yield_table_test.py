@@ -0,0 +1,57 @@
+import numpy as np
+import weather
+import photovoltaic_module
+from weather import yield_table
+from sun_position.spa import DAYS_IN_MONTH
+from tests.benchmark_utils import benchmark
+
+
+# monthly irradiation and DC output of surfaces from the full hourly transposition
+def hourly_monthly_sums(weather_profile, panel, slopes, azimuths, diffuse_model):
+    irradiance = weather.get_incident_radiation_by_surfaces(weather_profile, slopes, azimuths, diffuse_model)
+    dc = panel.get_mpp(t=weather_profile.temperature, g=irradiance, vw=weather_profile.wind_speed)
+
+    months = np.repeat(np.arange(12), np.array(DAYS_IN_MONTH) * 24)
+    monthly_irradiation = np.array([irradiance[:, months == month].sum(axis=1) for month in range(12)]).T
+    monthly_dc = np.array([dc[:, months == month].sum(axis=1) for month in range(12)]).T
+    return monthly_irradiation, monthly_dc
+
+
+# compares the table with the hourly transposition on and between its grid points
+if __name__ == "__main__":
+    weather_profile = weather.by_zip_code('52074')
+    panel = photovoltaic_module.SimpleEfficiencyModel(dict(mu_mpp=-0.351, mpp=290, width=1, height=1.63))
+    # annual values between the grid points of the default 5° x 10° grid, on average and on steep north faces
+    mean_tolerance, max_tolerance = 1e-3, 5e-3
+
+    for diffuse_model in ["isotropic", "perez"]:
+        table = yield_table.build(weather_profile, panel, diffuse_model=diffuse_model)
+
+        # grid points, including the ends of both axes
+        slopes = np.array([0, 5, 35, 60, 90, 90])
+        azimuths = np.array([0, 180, 210, 90, 270, 360])
+        irradiation, dc = hourly_monthly_sums(weather_profile, panel, slopes, azimuths, diffuse_model)
+        result = table.query(slopes, azimuths)
+        assert np.allclose(result.monthly_irradiation, irradiation, rtol=1e-12, atol=0), "grid irradiation differs"
+        assert np.allclose(result.monthly_dc, dc, rtol=1e-12, atol=0), "grid DC output differs"
+        assert np.allclose(result.annual_irradiation, irradiation.sum(axis=1), rtol=1e-12, atol=0)
+
+        # random surfaces between the grid points
+        rng = np.random.default_rng(0)
+        slopes, azimuths = rng.uniform(0, 90, 200), rng.uniform(0, 360, 200)
+        irradiation, dc = hourly_monthly_sums(weather_profile, panel, slopes, azimuths, diffuse_model)
+        result = table.query(slopes, azimuths)
+        error_irradiation = np.abs(result.annual_irradiation / irradiation.sum(axis=1) - 1)
+        error_dc = np.abs(result.annual_dc / dc.sum(axis=1) - 1)
+        for name, error in [("irradiation", error_irradiation), ("DC output", error_dc)]:
+            assert error.mean() < mean_tolerance, f"annual {name} off by {error.mean():.2%} on average"
+            assert error.max() < max_tolerance, f"annual {name} off by up to {error.max():.2%}"
+
+        t_query, _ = benchmark(lambda: table.query(slopes[0], azimuths[0]), 1000)
+        t_hourly, _ = benchmark(
+            lambda: hourly_monthly_sums(weather_profile, panel, slopes[:1], azimuths[:1], diffuse_model), 10
+        )
+
+        print(f"{diffuse_model}\tannual error irradiation mean {error_irradiation.mean():.3%} max {error_irradiation.max():.3%}"
+              f"\tDC mean {error_dc.mean():.3%} max {error_dc.max():.3%}")
+        print(f"timing\tquery {t_query * 1000:.3f} ms\thourly {t_hourly * 1000:.2f} ms")
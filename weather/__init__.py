@@ -1,5 +1,6 @@
 from .weather_profile import by_zip_code, set_dataset_path, get_dataset_path, WeatherData, RegionDoesNotExist
+from .weather_profile import set_cache_size, cache_info, cache_clear
 
-from .irradiation import get_incident_radiation
-
-
+from .irradiation import get_incident_radiation, get_incident_radiation_by_surfaces
+from . import irradiance_cache
+from . import yield_table
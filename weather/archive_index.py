@@ -0,0 +1,108 @@
+"""
+Zip code index of the DWD TRY archive.
+
+The index maps every zip code to its archive member and is built once per process.
+It is persisted next to the archive (e.g. data/dwd_zips_index.json) so that later
+processes find their entry without scanning the archive. Members are read as
+in-memory streams, nothing is extracted to disk.
+
+Zip codes whose members have identical content and coordinates lie in the same TRY
+grid cell. They share the zip code of the cell's first member as 'cell'.
+"""
+
+import io
+import os
+import json
+import tempfile
+import zipfile
+from storage.files import set_default_permissions
+
+
+# bumped whenever the layout of the persisted index changes
+INDEX_VERSION = 2
+
+# archive path -> index, built once per process
+__indices = {}
+
+
+def get_index_path(dataset_path: str) -> str:
+    return os.path.splitext(dataset_path)[0] + '_index.json'
+
+
+def __archive_signature(dataset_path: str) -> list:
+    stat = os.stat(dataset_path)
+    return [INDEX_VERSION, stat.st_size, stat.st_mtime_ns]
+
+
+def __build_index(dataset_path: str) -> dict:
+    entries = {}
+    cells = {}
+    with zipfile.ZipFile(dataset_path, 'r') as zip_ref:
+        for info in sorted(zip_ref.infolist(), key=lambda x: x.filename):
+            if info.is_dir() or not info.filename.endswith('.txt'):
+                continue
+            # e.g. dwd_zips/52062_Aachen_6.0854_50.7755.txt
+            infos = os.path.splitext(os.path.basename(info.filename))[0].split('_')
+            lon, lat = float(infos[2]), float(infos[3])
+            cell = cells.setdefault((info.CRC, info.file_size, lon, lat), infos[0])
+            entries[infos[0]] = {
+                'name': info.filename,
+                'crc': info.CRC,
+                'city': infos[1],
+                'lon': lon,
+                'lat': lat,
+                'cell': cell,
+            }
+    return entries
+
+
+def __read_persisted_index(index_path: str, signature: list):
+    try:
+        with open(index_path, 'r') as file:
+            persisted = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if persisted.get('archive') != signature:
+        return None
+    return persisted['entries']
+
+
+def __persist_index(index_path: str, signature: list, entries: dict) -> None:
+    # write to a temporary file and replace atomically, concurrent writers produce the same content
+    try:
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(index_path), prefix='.tmp_', suffix='.json')
+        with os.fdopen(fd, 'w') as file:
+            json.dump({'archive': signature, 'entries': entries}, file)
+        # readable by the workers of other users
+        set_default_permissions(temp_path)
+        os.replace(temp_path, index_path)
+    except OSError:
+        # a read-only dataset folder only costs a rebuild per process
+        pass
+
+
+def get_index(dataset_path: str) -> dict:
+    """
+    :return: dict of zip code -> {'name', 'crc', 'city', 'lon', 'lat', 'cell'} of the archive member
+    """
+    if dataset_path in __indices:
+        return __indices[dataset_path]
+
+    signature = __archive_signature(dataset_path)
+    index_path = get_index_path(dataset_path)
+
+    entries = __read_persisted_index(index_path, signature)
+    if entries is None:
+        entries = __build_index(dataset_path)
+        __persist_index(index_path, signature, entries)
+
+    __indices[dataset_path] = entries
+    return entries
+
+
+def read_entry(dataset_path: str, entry_name: str) -> io.StringIO:
+    """
+    Read an archive member into an in-memory text stream.
+    """
+    with zipfile.ZipFile(dataset_path, 'r') as zip_ref:
+        return io.StringIO(zip_ref.read(entry_name).decode('ascii'))
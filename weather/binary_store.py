@@ -0,0 +1,81 @@
+"""
+Columnar binary store for the DWD TRY dataset.
+
+Each entry of the weather archive is converted once into a folder holding one
+contiguous ``.npy`` array per DWD column. Later loads memory map these arrays
+instead of extracting and re-parsing the text file.
+"""
+
+import os
+import shutil
+import tempfile
+import numpy as np
+from storage.files import set_default_permissions
+
+
+# DWD column -> dtype of its array in the store
+COLUMNS = {
+    'RW': np.int32,
+    'HW': np.int32,
+    'MM': np.int8,
+    'DD': np.int8,
+    'HH': np.int8,
+    't':  np.float64,
+    'p':  np.int16,
+    'WR': np.int16,
+    'WG': np.float64,
+    'N':  np.int8,
+    'x':  np.float64,
+    'RF': np.int8,
+    'B':  np.float64,
+    'D':  np.float64,
+    'A':  np.float64,
+    'E':  np.float64,
+    'IL': np.int8,
+}
+
+
+def get_store_path(dataset_path: str) -> str:
+    # the store lives next to the archive, e.g. data/dwd_zips.zip -> data/dwd_zips_columns/
+    return os.path.splitext(dataset_path)[0] + '_columns'
+
+
+def get_entry_path(store_path: str, entry_name: str, crc: int) -> str:
+    # the CRC of the archive member invalidates the entry whenever the archive changes
+    stem = os.path.splitext(os.path.basename(entry_name))[0]
+    return os.path.join(store_path, f"{stem}_{crc:08x}")
+
+
+def load(entry_path: str):
+    """
+    Memory map all columns of a converted entry.
+    :return: dict of read-only arrays by DWD column, or None if the entry was not converted yet
+    """
+    if not os.path.isdir(entry_path):
+        return None
+    return {
+        column: np.load(os.path.join(entry_path, column + '.npy'), mmap_mode='r')
+        for column in COLUMNS
+    }
+
+
+def save(entry_path: str, data: dict) -> None:
+    """
+    Write all columns of an entry. The folder is written under a temporary name and renamed
+    afterwards, so concurrent readers never see a partially written entry.
+    """
+    store_path = os.path.dirname(entry_path)
+    os.makedirs(store_path, exist_ok=True)
+
+    temp_path = tempfile.mkdtemp(dir=store_path, prefix='.tmp_')
+    try:
+        for column, dtype in COLUMNS.items():
+            np.save(os.path.join(temp_path, column + '.npy'), np.asarray(data[column], dtype=dtype))
+        # readable by the workers of other users
+        set_default_permissions(temp_path, directory=True)
+        os.rename(temp_path, entry_path)
+    except OSError:
+        # another process converted the same entry in the meantime
+        shutil.rmtree(temp_path, ignore_errors=True)
+        if not os.path.isdir(entry_path):
+            raise
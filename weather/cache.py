@@ -0,0 +1,70 @@
+"""
+Process-wide cache of weather profiles.
+
+Entries are evicted in least recently used order once their total size exceeds the
+memory bound. Cached WeatherData objects hold read-only arrays and are shared between callers.
+"""
+
+import threading
+from collections import OrderedDict
+from storage.disk_cache import CacheInfo
+
+
+class WeatherCache:
+    def __init__(self, max_bytes=64 * 2**20):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._entries = OrderedDict()       # key -> (weather, size in bytes)
+        self._current_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key][0]
+
+    def put(self, key, weather) -> None:
+        size = weather.nbytes
+        with self._lock:
+            if key in self._entries:
+                self._current_bytes -= self._entries.pop(key)[1]
+
+            # an entry larger than the whole cache is not cached at all
+            if size > self.max_bytes:
+                return
+
+            self._entries[key] = (weather, size)
+            self._current_bytes += size
+            self._evict()
+
+    def resize(self, max_bytes) -> None:
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._current_bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(
+                self.hits, self.misses, self.evictions, len(self._entries), self._current_bytes, self.max_bytes
+            )
+
+    def _evict(self) -> None:
+        while self._current_bytes > self.max_bytes:
+            _, (_, size) = self._entries.popitem(last=False)
+            self._current_bytes -= size
+            self.evictions += 1
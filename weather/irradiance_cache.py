@@ -0,0 +1,66 @@
+"""
+Persistent cache of the hourly irradiance on tilted surfaces.
+
+Entries are keyed by the weather cell (with year, minute modifier and site elevation of its sun
+position), slope, orientation, diffuse model and albedo. Zip codes of the same TRY cell and
+surfaces of equal slope and orientation, within a building or across buildings, share an entry.
+"""
+
+import numpy as np
+from storage.disk_cache import DiskCache, get_cache_path
+from .weather_profile import WeatherData
+from .irradiation import get_incident_radiation_by_surfaces
+
+
+# irradiance of single surfaces
+disk_cache = DiskCache(get_cache_path('irradiance'))
+
+
+def by_surfaces(
+        weather_profile: WeatherData,
+        inclinations, azimuths,
+        diffuse_model="isotropic",
+        albedo=0.2,
+        daylight_only=False
+) -> np.ndarray:
+    """
+    get_incident_radiation_by_surfaces that computes every distinct (slope, orientation) only once
+    and reuses the results of earlier calls and processes.
+    daylight_only does not change the results, they are shared with full-year computations.
+    :param inclinations: slopes of the surfaces in [°]
+    :param azimuths: orientations of the surfaces in [°]
+    :return: numpy array of shape (n_surfaces, hours) of the hourly irradiance in [W/m²]
+    """
+    surfaces = np.stack([
+        np.asarray(inclinations, dtype=np.float64).ravel(),
+        np.asarray(azimuths, dtype=np.float64).ravel()
+    ], axis=1)
+    unique_surfaces, surface_index = np.unique(surfaces, axis=0, return_inverse=True)
+
+    use_disk = weather_profile.profile_key is not None
+    keys = [
+        (weather_profile.profile_key, float(slope), float(orientation), diffuse_model, float(albedo))
+        for slope, orientation in unique_surfaces
+    ]
+
+    irradiance = np.empty((len(unique_surfaces), weather_profile.length))
+    missing = []
+    for i, key in enumerate(keys):
+        entry = disk_cache.get(key) if use_disk else None
+        if entry is None:
+            missing.append(i)
+        else:
+            irradiance[i] = entry['irradiance']
+
+    if missing:
+        irradiance[missing] = get_incident_radiation_by_surfaces(
+            weather_profile,
+            unique_surfaces[missing, 0], unique_surfaces[missing, 1],
+            diffuse_model=diffuse_model, albedo=albedo, daylight_only=daylight_only
+        )
+        if use_disk:
+            for i in missing:
+                disk_cache.put(keys[i], {'irradiance': irradiance[i]}, evict=False)
+            disk_cache.evict()
+
+    return irradiance[surface_index.ravel()]
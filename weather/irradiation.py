@@ -1,98 +1,58 @@
-
-from math import cos, sin, pi, acos, floor
+import numpy as np
 from .weather_profile import WeatherData
 from .perez import perez_diffusion
 
 def deg2rad(a):
-    return a * pi / 180
+    return a * np.pi / 180
 
 
 def rad2deg(a):
-    return a * 180 / pi
-
-
-def direct_irradiation_tilted(inclination: float, azimuth: float, weather_profile: WeatherData, radiation: list, roof_index: int):
-    res = []
-
-    # These are used for logging
-    angle_inc = []
-    angle_sun_alts = []
-    angle_sun_azis = []
-
-    for i in range(8760):
-        sun_altitude = weather_profile.sun_altitude[i]
-        gamma_s = weather_profile.sun_azimuth[i]
-        sun_rise = weather_profile.sunrise[i]
-
-        theta_incidence = cos(deg2rad(sun_altitude)) * sin(deg2rad(inclination)) * cos(deg2rad(azimuth - gamma_s)) \
-                        + sin(deg2rad(sun_altitude)) * cos(deg2rad(inclination))
-        theta_incidence = acos(theta_incidence)
-
-        if sun_altitude < -0.25 or \
-                not (
-                        ((i % 24 + 0.5) - sun_rise) > 0 or floor(sun_rise) != floor((i % 24 + 0.5))
-                ):
-            theta_incidence = 0
-
-        i_direct_tilted = cos(theta_incidence) / sin(deg2rad(sun_altitude)) * radiation[i]
-
-        angle_sun_azis.append(gamma_s)
-        angle_sun_alts.append(sun_altitude)
-
-        i_direct_tilted = max(i_direct_tilted, 0)
-
-        res.append(i_direct_tilted)
-
-        angle_inc.append(theta_incidence * 180 / pi)
-
-    # if roof_index == logger.debugging_roof_index():
-    #     logger.add_column(f"sun_azi", angle_sun_azis)
-    #     logger.add_column(f"sun_alt", angle_sun_alts)
-    #     logger.add_column(f"angle_inc", angle_inc)
-
-    return res
+    return a * 180 / np.pi
 
 
-def diffuse_irradiation_tilted(inclination: float, radiation: list, weather_profile: WeatherData):
-    ls = []
-    for i in range(8760):
-        i_diffuse_tilted = (1 + cos(deg2rad(inclination))) * radiation[i] / 2
-        i_diffuse_tilted = max(i_diffuse_tilted, 0)
+def direct_irradiation_tilted(inclination: float, azimuth: float, weather_profile: WeatherData, radiation, roof_index: int) -> np.ndarray:
+    sun_altitude = np.asarray(weather_profile.sun_altitude)
+    gamma_s = np.asarray(weather_profile.sun_azimuth)
+    sun_rise = np.asarray(weather_profile.sunrise)[weather_profile.day_index]
+    hour_of_day = np.asarray(weather_profile.hours) % 24 + 0.5
 
-        if weather_profile.sun_altitude[i] < -0.25:
-            i_diffuse_tilted = 0
+    theta_incidence = np.cos(deg2rad(sun_altitude)) * np.sin(deg2rad(inclination)) * np.cos(deg2rad(azimuth - gamma_s)) \
+                    + np.sin(deg2rad(sun_altitude)) * np.cos(deg2rad(inclination))
+    theta_incidence = np.arccos(np.clip(theta_incidence, -1, 1))
 
-        ls.append(i_diffuse_tilted)
+    # no direct irradiation before sunrise
+    night = (sun_altitude < -0.25) | ~(
+            ((hour_of_day - sun_rise) > 0) | (np.floor(sun_rise) != np.floor(hour_of_day))
+    )
+    theta_incidence = np.where(night, 0, theta_incidence)
 
-    return ls
+    with np.errstate(divide='ignore', invalid='ignore'):
+        i_direct_tilted = np.cos(theta_incidence) / np.sin(deg2rad(sun_altitude)) * radiation
 
+    return np.maximum(i_direct_tilted, 0)
 
-def reflected_irradiation_tilted(inclination: float, direct_radiation: list, diffuse_radiation: list, weather_profile: WeatherData, albedo=0.2, threshold=-0.25):
-    ls = []
-    for i in range(8760):
 
-        radiation = direct_radiation[i] + diffuse_radiation[i]
-        i_reflect_tilted = (1 - cos(deg2rad(inclination))) * radiation / 2 * albedo
-        i_reflect_tilted = max(i_reflect_tilted, 0)
+def diffuse_irradiation_tilted(inclination: float, radiation, weather_profile: WeatherData) -> np.ndarray:
+    i_diffuse_tilted = np.maximum((1 + np.cos(deg2rad(inclination))) * np.asarray(radiation) / 2, 0)
+    return np.where(np.asarray(weather_profile.sun_altitude) < -0.25, 0, i_diffuse_tilted)
 
-        if weather_profile.sun_altitude[i] < threshold:
-            i_reflect_tilted = 0
 
-        ls.append(i_reflect_tilted)
-
-    return ls
+def reflected_irradiation_tilted(inclination: float, direct_radiation, diffuse_radiation, weather_profile: WeatherData, albedo=0.2, threshold=-0.25) -> np.ndarray:
+    radiation = np.asarray(direct_radiation) + np.asarray(diffuse_radiation)
+    i_reflect_tilted = np.maximum((1 - np.cos(deg2rad(inclination))) * radiation / 2 * albedo, 0)
+    return np.where(np.asarray(weather_profile.sun_altitude) < threshold, 0, i_reflect_tilted)
 
 
 def global_irradiation_tilted(
         inclination: float,
         azimuth: float,
         weather_profile: WeatherData,
-        direct_radiation: list,
-        diffuse_radiation: list,
+        direct_radiation,
+        diffuse_radiation,
         roof_index,
         diffuse_model="isotropic",
         albedo=0.2
-) -> list:
+) -> np.ndarray:
 
     direct = direct_irradiation_tilted(inclination, azimuth, weather_profile, direct_radiation, roof_index=roof_index)
 
@@ -107,12 +67,7 @@ def global_irradiation_tilted(
     else:
         raise ValueError("Diffuse irradiation model is not defined!")
 
-
-
-
-    i_global = [direct[i] + diffuse[i] + reflect[i] for i in range(8760)]
-
-    return i_global
+    return direct + np.asarray(diffuse) + reflect
 
 
 def get_incident_radiation(
@@ -120,23 +75,29 @@ def get_incident_radiation(
         inclination: float, azimuth,
         roof_index,
         diffuse_model="isotropic",
-        albedo=0.2
-) -> list:
-
-    adjusted_beam = []
-    sin_alt = []
-
-    # clip direct horizontal irradiance between [0..1100]
-    for h in range(8760):
-        alt = weather_profile.sun_altitude[h]
-        _pa = alt * pi / 180
-        _si = sin(_pa)
-        dni = weather_profile.direct_horizontal_irradiance[h] / _si
-        dni = max(0, dni)
-        dni = min(1100, dni)
-
-        adjusted_beam.append(dni*_si)
-        sin_alt.append(_si)
+        albedo=0.2,
+        daylight_only=False
+) -> np.ndarray:
+    """
+    Global irradiance on a tilted surface for every hour of the weather profile.
+    inclination and azimuth may also be arrays of shape (n, 1) for n surfaces, see get_incident_radiation_by_surfaces.
+    :param daylight_only: only compute the daylight hours of the profile, the others are zero
+    :return: numpy array of the hourly irradiance in [W/m²]
+    """
+    if daylight_only:
+        return weather_profile.scatter(get_incident_radiation(
+            weather_profile.daylight(), inclination, azimuth, roof_index, diffuse_model=diffuse_model, albedo=albedo
+        ))
+
+    sin_alt = np.sin(np.asarray(weather_profile.sun_altitude) * np.pi / 180)
+
+    # clip direct normal irradiance between [0..1100]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        dni = np.asarray(weather_profile.direct_horizontal_irradiance) / sin_alt
+    dni = np.where(dni > 0, dni, 0)
+    dni = np.where(dni < 1100, dni, 1100)
+
+    adjusted_beam = dni * sin_alt
 
     return global_irradiation_tilted(
         inclination,
@@ -147,4 +108,27 @@ def get_incident_radiation(
         albedo=albedo,
         diffuse_model=diffuse_model,
         roof_index=roof_index
-    )
\ No newline at end of file
+    )
+
+
+def get_incident_radiation_by_surfaces(
+        weather_profile: WeatherData,
+        inclinations, azimuths,
+        diffuse_model="isotropic",
+        albedo=0.2,
+        daylight_only=False
+) -> np.ndarray:
+    """
+    Global irradiance on several tilted surfaces in one pass, the sun geometry and the clipped beam
+    are computed once for all of them.
+    :param inclinations: slopes of the surfaces in [°]
+    :param azimuths: orientations of the surfaces in [°]
+    :return: numpy array of shape (n_surfaces, hours) of the hourly irradiance in [W/m²]
+    """
+    inclinations = np.asarray(inclinations, dtype=np.float64).reshape(-1, 1)
+    azimuths = np.asarray(azimuths, dtype=np.float64).reshape(-1, 1)
+
+    return get_incident_radiation(
+        weather_profile, inclinations, azimuths, roof_index=None,
+        diffuse_model=diffuse_model, albedo=albedo, daylight_only=daylight_only
+    )
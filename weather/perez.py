@@ -3,159 +3,113 @@ Perez model
 Source: https://www.nrel.gov/docs/fy15osti/64102.pdf (p. 24)
 """
 
-from math import sin, cos, pi, acos
+import numpy as np
 from .weather_profile import WeatherData
 
 def deg2rad(a):
-    return a * pi / 180
+    return a * np.pi / 180
 
 
 def rad2deg(a):
-    return a * 180 / pi
+    return a * 180 / np.pi
 
 
 # Perez model constants
-f11 = [-0.0083117,  0.1299457,  0.3296958,  0.5682053,  0.873028,   1.1326077,  1.0601591,  0.6777470  ]
-f12 = [ 0.5877285,  0.6825954,  0.4868735,  0.1874525, -0.3920403, -1.2367284, -1.5999137, -0.3272588  ]
-f13 = [-0.0620636, -0.1513752, -0.2210958, -0.2951290, -0.3616149, -0.4118494, -0.3589221, -0.2504286  ]
-f21 = [-0.0596012, -0.0189325,  0.0554140,  0.1088631,  0.2255647,  0.2877813,  0.2642124,  0.1561313  ]
-f22 = [ 0.0721249,  0.065965,  -0.0639588, -0.1519229, -0.4620442, -0.8230357, -1.127234,  -1.3765031  ]
-f23 = [-0.0220216, -0.0288748, -0.0260542, -0.0139754,  0.0012448,  0.0558651,  0.1310694,  0.2506212  ]
+f11 = np.array([-0.0083117,  0.1299457,  0.3296958,  0.5682053,  0.873028,   1.1326077,  1.0601591,  0.6777470  ])
+f12 = np.array([ 0.5877285,  0.6825954,  0.4868735,  0.1874525, -0.3920403, -1.2367284, -1.5999137, -0.3272588  ])
+f13 = np.array([-0.0620636, -0.1513752, -0.2210958, -0.2951290, -0.3616149, -0.4118494, -0.3589221, -0.2504286  ])
+f21 = np.array([-0.0596012, -0.0189325,  0.0554140,  0.1088631,  0.2255647,  0.2877813,  0.2642124,  0.1561313  ])
+f22 = np.array([ 0.0721249,  0.065965,  -0.0639588, -0.1519229, -0.4620442, -0.8230357, -1.127234,  -1.3765031  ])
+f23 = np.array([-0.0220216, -0.0288748, -0.0260542, -0.0139754,  0.0012448,  0.0558651,  0.1310694,  0.2506212  ])
 
 k = 5.534e-6  # for angles in degrees
 
+# upper bounds of the sky clearness bins 1..7, bin 8 is unbounded
+eta_bin_edges = np.array([1.065, 1.230, 1.500, 1.950, 2.800, 4.500, 6.200])
+
 
 def sky_clearness_to_eta_bin(sky_clearness):
-    if sky_clearness <= 1.065:
-        return 1
-    if sky_clearness <= 1.230:
-        return 2
-    if sky_clearness <= 1.500:
-        return 3
-    if sky_clearness <= 1.950:
-        return 4
-    if sky_clearness <= 2.800:
-        return 5
-    if sky_clearness <= 4.500:
-        return 6
-    if sky_clearness <= 6.200:
-        return 7
-    return 8
-
-
-def get_f(f: list, sky_clearness: float):
-    return f[sky_clearness_to_eta_bin(sky_clearness)-1]
+    # a value on an upper bound belongs to the lower bin
+    return np.searchsorted(eta_bin_edges, sky_clearness, side='left') + 1
+
+
+def get_f(f: np.ndarray, eta_bin):
+    return f[eta_bin - 1]
 
 
 # absolute optical air mass with angles in degrees (AM0)
-def airmass(angle_of_incidence_rad: float, sun_altitude_deg):
-    return (cos(deg2rad(90 - sun_altitude_deg)) + 0.15 * (sun_altitude_deg + 3.9)**(-1.253))**-1
+def airmass(angle_of_incidence_rad, sun_altitude_deg):
+    return (np.cos(deg2rad(90 - sun_altitude_deg)) + 0.15 * (sun_altitude_deg + 3.9)**(-1.253))**-1
 
 
-def delta(dhi: float, airmass: float) -> float:
+def delta(dhi, airmass):
     return dhi * airmass / 1367  # extraterrestrial irradiance
 
 
-def sky_clearness(dhi: float, dni: float, sun_alt_deg: float) -> float:
+def sky_clearness(dhi, dni, sun_alt_deg):
     _a = (dhi + dni)/dhi
     _k_sun_azimuth_3 = k * (90 - sun_alt_deg)**3
     return (_a + _k_sun_azimuth_3)/(1 + _k_sun_azimuth_3)
 
 
-def f1(_delta: float, sun_alt_rad: float, sky_clearness: float):
-    _f11 = get_f(f11, sky_clearness)
-    _f12 = get_f(f12, sky_clearness)
-    _f13 = get_f(f13, sky_clearness)
-    return max(0, _f11 + _f12 * _delta + (pi/2 - sun_alt_rad) * _f13)
+def f1(_delta, sun_alt_rad, eta_bin):
+    return np.maximum(0, get_f(f11, eta_bin) + get_f(f12, eta_bin) * _delta + (np.pi/2 - sun_alt_rad) * get_f(f13, eta_bin))
 
 
-def f2(_delta: float, sun_alt_rad: float, sky_clearness: float):
-    _f21 = get_f(f21, sky_clearness)
-    _f22 = get_f(f22, sky_clearness)
-    _f23 = get_f(f23, sky_clearness)
-    return _f21 + _f22 * _delta + (pi/2 - sun_alt_rad) * _f23
+def f2(_delta, sun_alt_rad, eta_bin):
+    return get_f(f21, eta_bin) + get_f(f22, eta_bin) * _delta + (np.pi/2 - sun_alt_rad) * get_f(f23, eta_bin)
 
 
 def a(angle_of_incidence):
-    return max(0, cos(angle_of_incidence))
+    return np.maximum(0, np.cos(angle_of_incidence))
 
 
 def b(angle_of_incidence):
-    return max(cos(deg2rad(85)), cos(angle_of_incidence))
-
-
-def perez_diffusion(inclination: float, azimuth: float, weather_profile: WeatherData) -> list:
-
-    ls = []
-    absolute_airmass = []
-
-
-
-    for i in range(8760):
-
-        if azimuth == 205 and i == 40:
-            print("hi")
-
-        sun_alt_deg = weather_profile.sun_altitude[i]
-        sun_azi_deg = weather_profile.sun_azimuth[i]
-
-        dni = weather_profile.direct_horizontal_irradiance[i] / sin(deg2rad(sun_alt_deg))
-        dhi = weather_profile.diffuse_horizontal_irradiance[i]
-
-        _di = 0
-        _dc = 0
-        _dh = 0
-        _airmass = 0
-
-        if sun_alt_deg > -0.25:
-            _di = dhi * (1 + cos(deg2rad(inclination))) / 2
-
-        if sun_alt_deg > 2.5:
-            theta_incidence = cos(deg2rad(sun_alt_deg)) * sin(deg2rad(inclination)) * cos(
-                deg2rad(azimuth - sun_azi_deg)) \
-                              + sin(deg2rad(sun_alt_deg)) * cos(deg2rad(inclination))
-            theta_incidence = acos(theta_incidence)
-
-            _sky_clearness = sky_clearness(dhi=dhi, dni=dni, sun_alt_deg=sun_alt_deg)
-            _airmass = airmass(theta_incidence, sun_alt_deg)
-            _delta = delta(dhi=dhi, airmass=_airmass)
-
-            _f1 = f1(_delta=_delta, sun_alt_rad=deg2rad(sun_alt_deg), sky_clearness=_sky_clearness)
-            _f2 = f2(_delta=_delta, sun_alt_rad=deg2rad(sun_alt_deg), sky_clearness=_sky_clearness)
-
-            _a = a(theta_incidence)
-            _b = b(deg2rad(90 - sun_alt_deg))
-
-            _di = dhi * (1 - _f1) * (1 + cos(deg2rad(inclination))) / 2
-            _dc = dhi * _f1 * _a / _b
-            _dh = dhi * _f2 * sin(deg2rad(inclination))
-
-
-
-        ls.append(_di + _dc + _dh)
-        absolute_airmass.append(_airmass)
-
-
-    return ls
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
+    return np.maximum(np.cos(deg2rad(85)), np.cos(angle_of_incidence))
+
+
+def perez_diffusion(inclination: float, azimuth: float, weather_profile: WeatherData) -> np.ndarray:
+    """
+    Diffuse irradiance on a tilted surface for every hour of the weather profile.
+    Below 2.5° of sun altitude the diffuse irradiance is taken as isotropic.
+    :return: numpy array of the hourly diffuse irradiance in [W/m²]
+    """
+    sun_alt_deg = np.asarray(weather_profile.sun_altitude)
+    sun_azi_deg = np.asarray(weather_profile.sun_azimuth)
+    dhi = np.asarray(weather_profile.diffuse_horizontal_irradiance)
+
+    isotropic = np.where(sun_alt_deg > -0.25, dhi * (1 + np.cos(deg2rad(inclination))) / 2, 0)
+    # one row per surface when inclination or azimuth are arrays of shape (n, 1)
+    isotropic = np.broadcast_to(isotropic, np.broadcast_shapes(isotropic.shape, np.shape(azimuth))).copy()
+
+    # the model is only evaluated for the hours with the sun above 2.5°
+    sunny = sun_alt_deg > 2.5
+    sun_alt_deg = sun_alt_deg[sunny]
+    sun_azi_deg = sun_azi_deg[sunny]
+    dhi = dhi[sunny]
+    dni = np.asarray(weather_profile.direct_horizontal_irradiance)[sunny] / np.sin(deg2rad(sun_alt_deg))
+
+    theta_incidence = np.cos(deg2rad(sun_alt_deg)) * np.sin(deg2rad(inclination)) * np.cos(
+        deg2rad(azimuth - sun_azi_deg)) \
+                      + np.sin(deg2rad(sun_alt_deg)) * np.cos(deg2rad(inclination))
+    theta_incidence = np.arccos(np.clip(theta_incidence, -1, 1))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        _sky_clearness = sky_clearness(dhi=dhi, dni=dni, sun_alt_deg=sun_alt_deg)
+    eta_bin = sky_clearness_to_eta_bin(_sky_clearness)
+
+    _airmass = airmass(theta_incidence, sun_alt_deg)
+    _delta = delta(dhi=dhi, airmass=_airmass)
+
+    _f1 = f1(_delta=_delta, sun_alt_rad=deg2rad(sun_alt_deg), eta_bin=eta_bin)
+    _f2 = f2(_delta=_delta, sun_alt_rad=deg2rad(sun_alt_deg), eta_bin=eta_bin)
+
+    _a = a(theta_incidence)
+    _b = b(deg2rad(90 - sun_alt_deg))
+
+    _di = dhi * (1 - _f1) * (1 + np.cos(deg2rad(inclination))) / 2
+    _dc = dhi * _f1 * _a / _b
+    _dh = dhi * _f2 * np.sin(deg2rad(inclination))
+
+    isotropic[..., sunny] = _di + _dc + _dh
+    return isotropic
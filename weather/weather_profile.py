@@ -1,12 +1,14 @@
 
-import zipfile
 import os
+import copy
+import numpy as np
 import sun_position
+from . import binary_store, archive_index
+from .cache import WeatherCache
 
 #
 #
 DWD_DATASET_PATH = 'data/dwd_zips.zip'
-SUB_FOLDER = 'dwd_zips/'
 
 
 def set_dataset_path(path):
@@ -18,6 +20,22 @@ def get_dataset_path():
     return DWD_DATASET_PATH
 
 
+# weather profiles by (archive path, TRY cell, year, minute_modifier, site_elev, member CRC)
+__cache = WeatherCache()
+
+
+def set_cache_size(max_bytes):
+    __cache.resize(max_bytes)
+
+
+def cache_info():
+    return __cache.info()
+
+
+def cache_clear():
+    __cache.clear()
+
+
 '''
 Data as given in the DWD dataset:
 
@@ -41,80 +59,161 @@ IL Qualitaetsbit bezueglich der Auswahlkriterien                           {0;1;
 '''
 
 
+def read_only_array(values, dtype=np.float64) -> np.ndarray:
+    """
+    Contiguous read-only array of the values, shares memory with them whenever the dtype matches.
+    """
+    array = np.ascontiguousarray(values, dtype=dtype).view()
+    array.flags.writeable = False
+    return array
+
+
+# sun altitude in [°] below which no irradiance reaches tilted surfaces
+DAYLIGHT_ALTITUDE = -0.25
+
+
 # wrapper class for weather data
 class WeatherData:
+    """
+    Hourly series are contiguous read-only arrays, which also behave like lists for indexing,
+    slicing and iteration. as_lists() returns plain python lists for code that needs them.
+    Integer coded series (wind direction, cloud cover, humidity) are stored losslessly as float32.
+    cell is the zip code that represents the TRY grid cell, zip codes of the same cell share all arrays.
+    profile_key identifies the series of the cell and their sun position for derived caches, None if unknown.
+    hours holds the hour of year of every timestep, daylight_hours the timesteps with the sun above DAYLIGHT_ALTITUDE.
+    """
+    __slots__ = (
+        'zip_code', 'longitude', 'latitude', 'city_name', 'location', 'cell',
+        'temperature', 'pressure', 'wind_direction', 'wind_speed', 'sky_clearness',
+        'mass_mixing_ratio', 'relative_humidity',
+        'direct_horizontal_irradiance', 'diffuse_horizontal_irradiance',
+        'sun_altitude', 'sun_azimuth', 'sunrise', 'sunset', 'day_index',
+        'hours', 'daylight_hours',
+        'length', 'profile_key',
+    )
+
+    # series that are returned by as_lists()
+    series = (
+        'temperature', 'pressure', 'wind_direction', 'wind_speed', 'sky_clearness',
+        'mass_mixing_ratio', 'relative_humidity',
+        'direct_horizontal_irradiance', 'diffuse_horizontal_irradiance',
+        'sun_altitude', 'sun_azimuth', 'sunrise', 'sunset', 'day_index',
+        'hours', 'daylight_hours',
+    )
+
+    # series with one value per timestep
+    hourly_series = (
+        'temperature', 'pressure', 'wind_direction', 'wind_speed', 'sky_clearness',
+        'mass_mixing_ratio', 'relative_humidity',
+        'direct_horizontal_irradiance', 'diffuse_horizontal_irradiance',
+        'sun_altitude', 'sun_azimuth', 'day_index', 'hours',
+    )
+
     def __init__(self, data: dict):
         self.zip_code = data['zip_code']
         self.longitude = data['lon']
         self.latitude = data['lat']
         self.city_name = data['city']
-
-        self.location = data['data']['RW'][0], data['data']['HW'][0]       # Rechtswert, Hochwert
-        self.temperature = data['data']['t']
-        self.pressure = data['data']['p']
-        self.wind_direction = data['data']['WR']
-        self.wind_speed = data['data']['WG']
-        self.sky_clearness = data['data']['N']
-        self.mass_mixing_ratio = data['data']['x']      # absolute humidity
-        self.relative_humidity = data['data']['RF']
-        self.direct_horizontal_irradiance = data['data']['B']
-        self.diffuse_horizontal_irradiance = data['data']['D']
+        self.cell = data.get('cell', data['zip_code'])
+
+        self.location = int(data['data']['RW'][0]), int(data['data']['HW'][0])       # Rechtswert, Hochwert
+        self.temperature = read_only_array(data['data']['t'])
+        self.pressure = read_only_array(data['data']['p'])
+        self.wind_direction = read_only_array(data['data']['WR'], np.float32)
+        self.wind_speed = read_only_array(data['data']['WG'])
+        self.sky_clearness = read_only_array(data['data']['N'], np.float32)
+        self.mass_mixing_ratio = read_only_array(data['data']['x'])      # absolute humidity
+        self.relative_humidity = read_only_array(data['data']['RF'], np.float32)
+        self.direct_horizontal_irradiance = read_only_array(data['data']['B'])
+        self.diffuse_horizontal_irradiance = read_only_array(data['data']['D'])
 
         self.sun_altitude = None
         self.sun_azimuth = None
         self.sunrise = None
         self.sunset = None
+        self.day_index = None
+        self.daylight_hours = None
 
         self.length = len(self.temperature)
+        self.hours = read_only_array(np.arange(self.length), np.int16)
+        self.profile_key = None
+
+    def set_sun_position(self, altitude, azimuth, sunrise, sunset, day_index) -> None:
+        # sunrise and sunset are stored once per day, day_index maps every hour to its day
+        self.sun_altitude = read_only_array(altitude)
+        self.sun_azimuth = read_only_array(azimuth)
+        self.sunrise = read_only_array(sunrise)
+        self.sunset = read_only_array(sunset)
+        self.day_index = read_only_array(day_index, np.int16)
+        self.daylight_hours = read_only_array(np.flatnonzero(self.sun_altitude >= DAYLIGHT_ALTITUDE), np.int16)
+
+    def for_zip_code(self, zip_code: str, city_name: str) -> 'WeatherData':
+        # shallow copy for another zip code of the same TRY cell, all arrays are shared
+        weather = copy.copy(self)
+        weather.zip_code = zip_code
+        weather.city_name = city_name
+        return weather
+
+    def daylight(self) -> 'WeatherData':
+        """
+        Sparse profile of the daylight timesteps only. Irradiance on tilted surfaces and PV output are zero
+        at all other timesteps, so these stages can run on the sparse profile and scatter() their results back.
+        """
+        weather = copy.copy(self)
+        for name in WeatherData.hourly_series:
+            values = getattr(self, name)
+            setattr(weather, name, read_only_array(values[self.daylight_hours], values.dtype))
+        weather.length = len(self.daylight_hours)
+        weather.daylight_hours = read_only_array(np.arange(weather.length), np.int16)
+        if self.profile_key is not None:
+            weather.profile_key = self.profile_key + ('daylight',)
+        return weather
+
+    def scatter(self, values, fill=0.0) -> np.ndarray:
+        """
+        Expand values computed on daylight() to all timesteps of this profile.
+        :param values: array with the daylight timesteps on the last axis
+        """
+        values = np.asarray(values)
+        result = np.full(values.shape[:-1] + (self.length,), fill, dtype=values.dtype)
+        result[..., self.daylight_hours] = values
+        return result
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in WeatherData.series if getattr(self, name) is not None)
+
+    def as_lists(self) -> dict:
+        return {
+            name: getattr(self, name).tolist() if getattr(self, name) is not None else None
+            for name in WeatherData.series
+        }
 
 
 class RegionDoesNotExist(Exception):
     pass
 
 
-def __read__lines(path):
-    lines = []
-    with open(path, newline='') as file:
-        _lines = file.readlines()
-        for line in _lines:
-            lines.append(line.strip()
-                         .replace('  ', ' ')
-                         .replace('  ', ' ')
-                         )
-    return lines
-
-
-def __get_processed_entry(lines):
-    start_line = 34
-    _ls = []
-    for i in range(8760):
-        curr = lines[start_line + i].split(' ')
-        _ls.append(curr)
-    # transpose
-    res = list(map(list, zip(*_ls)))
-    return {
-        'RW': [int(i) for i in res[0]],
-        'HW': [int(i) for i in res[1]],
-        'MM': [int(i) for i in res[2]],
-        'DD': [int(i) for i in res[3]],
-        'HH': [int(i) for i in res[4]],
-        't':  [float(i) for i in res[5]],
-        'p':  [int(i) for i in res[6]],
-        'WR': [int(i) for i in res[7]],
-        'WG': [float(i) for i in res[8]],
-        'N':  [int(i) for i in res[9]],
-        'x':  [float(i) for i in res[10]],
-        'RF': [int(i) for i in res[11]],
-        'B':  [float(i) for i in res[12]],
-        'D':  [float(i) for i in res[13]],
-        'A':  [float(i) for i in res[14]],
-        'E':  [float(i) for i in res[15]],
-        'IL': [int(i) for i in res[16]],
-    }
+# number of header lines before the hourly data block of a DWD TRY entry
+HEADER_LINES = 34
 
 
-# get weather profile from DWD without sun_position position
-def __by_zip_code(zip_code: str) -> WeatherData:
+def parse_entry(file) -> dict:
+    """
+    Parse the 8760 hourly rows of a DWD TRY entry in one pass.
+    :param file: text stream of the entry
+    :return: dict of typed arrays by DWD column
+    """
+    rows = np.loadtxt(
+        file,
+        dtype=[(column, dtype) for column, dtype in binary_store.COLUMNS.items()],
+        skiprows=HEADER_LINES,
+        max_rows=8760
+    )
+    return {column: rows[column] for column in binary_store.COLUMNS}
+
+
+def __get_index_entry(zip_code: str) -> (str, dict):
     path = os.path.join(
         os.path.split(
             os.path.split(os.path.abspath(__file__))[0]
@@ -122,53 +221,65 @@ def __by_zip_code(zip_code: str) -> WeatherData:
         DWD_DATASET_PATH
     )
 
-    with zipfile.ZipFile(path, 'r') as zip_ref:
-        entries = zip_ref.namelist()[1:]
-        for entry in entries:
-            infos = entry[len(SUB_FOLDER):-len('.txt')].split('_')
-            entry_zip = infos[0]
-            if entry_zip == zip_code:
-                # extract file
-                zip_ref.extract(entry, './temp/')
+    index = archive_index.get_index(path)
+    if zip_code not in index:
+        raise RegionDoesNotExist(f"Weather dataset does not include zip code: '{zip_code}'!")
+    return path, index[zip_code]
 
-                lines = __read__lines('./temp/'+entry)
 
-                data = __get_processed_entry(lines)
+# get weather profile from DWD without sun_position position
+def __by_zip_code(zip_code: str) -> WeatherData:
+    path, entry = __get_index_entry(zip_code)
 
-                os.remove('./temp/'+entry)
-                os.rmdir("./temp/"+SUB_FOLDER.split("/")[0])
-                os.rmdir("./temp/")
+    entry_path = binary_store.get_entry_path(binary_store.get_store_path(path), entry['name'], entry['crc'])
+    columns = binary_store.load(entry_path)
 
-                lon, lat = float(infos[2]), float(infos[3])
-                return WeatherData({
-                    'zip_code': entry_zip,
-                    'city': infos[1],
-                    'lon': lon,
-                    'lat': lat,
-                    'data': data
-                })
+    # convert the text file once into the columnar store
+    if columns is None:
+        binary_store.save(entry_path, parse_entry(archive_index.read_entry(path, entry['name'])))
+        columns = binary_store.load(entry_path)
 
-    raise RegionDoesNotExist(f"Weather dataset does not include zip code: '{zip_code}'!")
+    return WeatherData({
+        'zip_code': zip_code,
+        'city': entry['city'],
+        'lon': entry['lon'],
+        'lat': entry['lat'],
+        'cell': entry['cell'],
+        'data': columns
+    })
 
 
 # get weather profile with sun_position position
 def by_zip_code(zip_code: str, year=2008, minute_modifier=+0.5, site_elev=0) -> WeatherData:
+    path, entry = __get_index_entry(zip_code)
+
+    # all zip codes of a TRY cell share one parsed profile and sun position series,
+    # the CRC of the archive member invalidates derived caches whenever the archive changes
+    profile_key = (entry['cell'], year, minute_modifier, site_elev, entry['crc'])
+
+    # the archive path separates the profiles of several datasets within the process
+    key = (path,) + profile_key
+    weather = __cache.get(key)
+    if weather is None:
+        weather = __with_sun_position(entry['cell'], year, minute_modifier, site_elev)
+        weather.profile_key = profile_key
+        __cache.put(key, weather)
+
+    if weather.zip_code != zip_code:
+        weather = weather.for_zip_code(zip_code, entry['city'])
+    return weather
+
+
+def __with_sun_position(zip_code: str, year, minute_modifier, site_elev) -> WeatherData:
     weather = __by_zip_code(zip_code)
 
-    sunpos = [
-        sun_position.by_hour_of_year(h + minute_modifier,
-                                     weather.longitude, weather.latitude, timezone=1,
-                                     year=year, site_elev=site_elev,
-                                     temp=weather.temperature[h], pressure=weather.pressure[h]
-                                     )
-        for h in range(8760)
-    ]
-
-    alt, azi, sunrise, sunset = list(map(list, zip(*sunpos)))
-
-    weather.sun_altitude = alt
-    weather.sun_azimuth = azi
-    weather.sunrise = sunrise
-    weather.sunset = sunset
+    alt, azi, sunrise, sunset, day_index = sun_position.by_hours_of_year(
+        np.arange(8760) + minute_modifier,
+        weather.longitude, weather.latitude, timezone=1,
+        year=year, site_elev=site_elev,
+        temp=weather.temperature, pressure=weather.pressure
+    )
+
+    weather.set_sun_position(alt, azi, sunrise, sunset, day_index)
 
     return weather